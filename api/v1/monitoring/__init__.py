@@ -1,8 +1,12 @@
 from fastapi import APIRouter
 
+from .cache import cache_router
+from .database import database_router
 from .health import health_router
 
 monitoring_router = APIRouter()
 monitoring_router.include_router(health_router, prefix="/health", tags=["Health"])
+monitoring_router.include_router(cache_router, prefix="/cache", tags=["Cache"])
+monitoring_router.include_router(database_router, prefix="/database", tags=["Database"])
 
 __all__ = ["monitoring_router"]
@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from app.schemas.extras.metrics import CacheTagMetrics
+from core.cache import Cache
+
+cache_router = APIRouter()
+
+
+@cache_router.get("/")
+async def cache_metrics() -> dict[str, CacheTagMetrics]:
+    return Cache.metrics.snapshot()
@@ -0,0 +1,18 @@
+from fastapi import APIRouter
+
+from app.schemas.extras.metrics import PoolStats, StatementCacheStats
+from core.database.pool import pool_stats
+from core.database.session import engines
+from core.database.statements import statement_cache_stats
+
+database_router = APIRouter()
+
+
+@database_router.get("/")
+async def database_pools() -> dict[str, PoolStats]:
+    return pool_stats(engines)
+
+
+@database_router.get("/statements")
+async def statement_cache() -> dict[str, StatementCacheStats]:
+    return statement_cache_stats(engines)
@@ -8,6 +8,7 @@ from app.schemas.requests.tasks import TaskCreate
 from app.schemas.responses.tasks import TaskResponse
 from core.factory import Factory
 from core.fastapi.dependencies.permissions import Permissions
+from core.fastapi.responses import StreamingJSONResponse, accepts_ndjson
 
 task_router = APIRouter()
 
@@ -24,6 +25,24 @@ async def get_tasks(
     return tasks
 
 
+@task_router.get("/stream", response_model=list[TaskResponse])
+async def stream_tasks(
+    request: Request,
+    task_controller: TaskController = Depends(Factory().get_task_controller),
+    assert_access: Callable = Depends(Permissions(TaskPermission.READ)),
+) -> StreamingJSONResponse:
+    async def readable_tasks():
+        async for task in task_controller.stream(
+            {"task_author_id": request.user.id}, order_by=("created_at", "id")
+        ):
+            assert_access(task)
+            yield task
+
+    return StreamingJSONResponse(
+        readable_tasks(), TaskResponse, ndjson=accepts_ndjson(request)
+    )
+
+
 @task_router.post("/", response_model=TaskResponse, status_code=201)
 async def create_task(
     request: Request,
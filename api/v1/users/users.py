@@ -1,6 +1,6 @@
 from typing import Callable
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 
 from app.controllers import AuthController, UserController
 from app.models.user import User, UserPermission
@@ -11,21 +11,65 @@ from core.factory import Factory
 from core.fastapi.dependencies import AuthenticationRequired
 from core.fastapi.dependencies.current_user import get_current_user
 from core.fastapi.dependencies.permissions import Permissions
+from core.fastapi.responses import StreamingJSONResponse, accepts_ndjson
 
 user_router = APIRouter()
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_EXACT_HEADER = "X-Total-Count-Exact"
+# The columns shown by UserResponse, listings never load the password hash.
+USER_LIST_FIELDS = {"email", "username", "uuid"}
+
 
 @user_router.get("/", dependencies=[Depends(AuthenticationRequired)])
 async def get_users(
+    response: Response,
+    after: str | None = Query(None, description="Cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
     user_controller: UserController = Depends(Factory().get_user_controller),
     assert_access: Callable = Depends(Permissions(UserPermission.READ)),
 ) -> list[UserResponse]:
-    users = await user_controller.get_all()
+    users, next_cursor = await user_controller.get_page(
+        after=after,
+        limit=limit,
+        order_by=("created_at", "id"),
+        fields=USER_LIST_FIELDS,
+    )
+
+    count = await user_controller.count()
 
     assert_access(resource=users)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    response.headers[TOTAL_COUNT_HEADER] = str(count.total)
+    response.headers[TOTAL_COUNT_EXACT_HEADER] = str(count.exact).lower()
+
     return users
 
 
+@user_router.get(
+    "/stream",
+    response_model=list[UserResponse],
+    dependencies=[Depends(AuthenticationRequired)],
+)
+async def stream_users(
+    request: Request,
+    user_controller: UserController = Depends(Factory().get_user_controller),
+    assert_access: Callable = Depends(Permissions(UserPermission.READ)),
+) -> StreamingJSONResponse:
+    async def readable_users():
+        async for user in user_controller.stream(
+            order_by=("created_at", "id"), fields=USER_LIST_FIELDS
+        ):
+            assert_access(resource=user)
+            yield user
+
+    return StreamingJSONResponse(
+        readable_users(), UserResponse, ndjson=accepts_ndjson(request)
+    )
+
+
 @user_router.post("/", status_code=201)
 async def register_user(
     register_user_request: RegisterUserRequest,
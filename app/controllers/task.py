@@ -1,16 +1,22 @@
 from app.models import Task
 from app.repositories import TaskRepository
+from core.cache import Cache, CacheTag
 from core.controller import BaseController
 from core.database.transactional import Propagation, Transactional
+from core.exceptions import NotFoundException
 
 
 class TaskController(BaseController[Task]):
     """Task controller."""
 
+    negative_cache_ttl = 30
+
     def __init__(self, task_repository: TaskRepository):
         super().__init__(model=Task, repository=task_repository)
         self.task_repository = task_repository
 
+    @Cache.cached(tag=CacheTag.GET_TASK_LIST_BY_AUTHOR, ttl=60)
+    @Transactional(propagation=Propagation.READ_ONLY)
     async def get_by_author_id(self, author_id: int) -> list[Task]:
         """
         Returns a list of tasks based on author_id.
@@ -32,13 +38,48 @@ class TaskController(BaseController[Task]):
         :return: The task.
         """
 
-        return await self.task_repository.create(
+        task = await self.task_repository.create(
             {
                 "title": title,
                 "description": description,
                 "task_author_id": author_id,
             }
         )
+        Cache.remove_by_tag_on_commit(
+            self.task_repository.session,
+            CacheTag.GET_TASK_LIST_BY_AUTHOR,
+            author_id=author_id,
+        )
+
+        return task
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def add_many(self, tasks: list[dict[str, str]], author_id: int) -> list[Task]:
+        """
+        Adds tasks in bulk.
+
+        :param tasks: The title and description of each task.
+        :param author_id: The author id.
+        :return: The tasks.
+        """
+
+        created = await self.task_repository.create_many(
+            [
+                {
+                    "title": task["title"],
+                    "description": task["description"],
+                    "task_author_id": author_id,
+                }
+                for task in tasks
+            ]
+        )
+        Cache.remove_by_tag_on_commit(
+            self.task_repository.session,
+            CacheTag.GET_TASK_LIST_BY_AUTHOR,
+            author_id=author_id,
+        )
+
+        return created
 
     @Transactional(propagation=Propagation.REQUIRED)
     async def complete(self, task_id: int) -> Task:
@@ -49,7 +90,70 @@ class TaskController(BaseController[Task]):
         :return: The task.
         """
 
-        task = await self.task_repository.get_by_id(task_id)
-        task.is_completed = True
+        tasks = await self.task_repository.update_where(
+            {"id": task_id}, {"is_completed": True}, returning=True
+        )
+        if not tasks:
+            raise NotFoundException(f"Tasks with id: {task_id} does not exist")
+
+        task = tasks[0]
+        Cache.remove_by_tag_on_commit(
+            self.task_repository.session,
+            CacheTag.GET_TASK_LIST_BY_AUTHOR,
+            author_id=task.task_author_id,
+        )
+        Cache.remove_by_tag_on_commit(
+            self.task_repository.session, CacheTag.GET_TASK, task_uuid=task.uuid
+        )
 
         return task
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def complete_all(self, author_id: int) -> int:
+        """
+        Completes every open task of an author.
+
+        :param author_id: The author id.
+        :return: The number of completed tasks.
+        """
+
+        tasks = await self.task_repository.update_where(
+            {"task_author_id": author_id, "is_completed": False},
+            {"is_completed": True},
+            returning=True,
+        )
+        Cache.remove_by_tag_on_commit(
+            self.task_repository.session,
+            CacheTag.GET_TASK_LIST_BY_AUTHOR,
+            author_id=author_id,
+        )
+        for task in tasks:
+            Cache.remove_by_tag_on_commit(
+                self.task_repository.session, CacheTag.GET_TASK, task_uuid=task.uuid
+            )
+
+        return len(tasks)
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def purge(self, author_id: int) -> int:
+        """
+        Deletes every task of an author.
+
+        :param author_id: The author id.
+        :return: The number of deleted tasks.
+        """
+
+        tasks = await self.task_repository.delete_where(
+            {"task_author_id": author_id}, returning=True
+        )
+        Cache.remove_by_tag_on_commit(
+            self.task_repository.session,
+            CacheTag.GET_TASK_LIST_BY_AUTHOR,
+            author_id=author_id,
+        )
+        for task in tasks:
+            Cache.remove_by_tag_on_commit(
+                self.task_repository.session, CacheTag.GET_TASK, task_uuid=task.uuid
+            )
+
+        return len(tasks)
@@ -4,6 +4,8 @@ from core.controller import BaseController
 
 
 class UserController(BaseController[User]):
+    negative_cache_ttl = 30
+
     def __init__(self, user_repository: UserRepository):
         super().__init__(model=User, repository=user_repository)
         self.user_repository = user_repository
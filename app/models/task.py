@@ -1,7 +1,7 @@
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, String
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Index, String
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -37,6 +37,7 @@ class Task(Base, TimestampMixin):
     author = relationship("User", back_populates="tasks", uselist=False, lazy="raise")
 
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (Index("ix_tasks_created_at_id", "created_at", "id"),)
 
     def __acl__(self):
         basic_permissions = [TaskPermission.CREATE]
@@ -1,7 +1,7 @@
 from enum import Enum
 from uuid import uuid4
 
-from sqlalchemy import BigInteger, Boolean, Column, Unicode
+from sqlalchemy import BigInteger, Boolean, Column, Index, Unicode
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -32,6 +32,7 @@ class User(Base, TimestampMixin):
     )
 
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     def __acl__(self):
         basic_permissions = [UserPermission.READ, UserPermission.CREATE]
@@ -1,5 +1,4 @@
-from sqlalchemy import Select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import func, select
 
 from app.models import Task
 from core.repository import BaseRepository
@@ -11,7 +10,7 @@ class TaskRepository(BaseRepository[Task]):
     """
 
     async def get_by_author_id(
-        self, author_id: int, join_: set[str] | None = None
+        self, author_id: int, join_: set[str] | dict[str, str] | None = None
     ) -> list[Task]:
         """
         Get all tasks by author id.
@@ -20,19 +19,26 @@ class TaskRepository(BaseRepository[Task]):
         :param join_: The joins to make.
         :return: A list of tasks.
         """
-        query = await self._query(join_)
+        query = self._query(join_)
         query = await self._get_by(query, "task_author_id", author_id)
 
         if join_ is not None:
-            return await self.all_unique(query)
+            return await self._all_unique(query)
 
         return await self._all(query)
 
-    def _join_author(self, query: Select) -> Select:
+    async def get_recent_author_ids(self, limit: int) -> list[int]:
         """
-        Join the author relationship.
+        Get the ids of the authors whose tasks changed most recently.
 
-        :param query: The query to join.
-        :return: The joined query.
+        :param limit: The number of author ids to return.
+        :return: A list of author ids.
         """
-        return query.options(joinedload(Task.author))
+        query = (
+            select(Task.task_author_id)
+            .group_by(Task.task_author_id)
+            .order_by(func.max(Task.updated_at).desc())
+            .limit(limit)
+        )
+        result = await self.session.scalars(query)
+        return list(result.all())
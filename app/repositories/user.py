@@ -1,6 +1,3 @@
-from sqlalchemy import Select
-from sqlalchemy.orm import joinedload
-
 from app.models import User
 from core.repository import BaseRepository
 
@@ -10,8 +7,11 @@ class UserRepository(BaseRepository[User]):
     User repository provides all the database operations for the User model.
     """
 
+    # Users are inserted by AuthController, which caches no misses itself.
+    negative_cache = True
+
     async def get_by_username(
-        self, username: str, join_: set[str] | None = None
+        self, username: str, join_: set[str] | dict[str, str] | None = None
     ) -> User | None:
         """
         Get user by username.
@@ -20,16 +20,16 @@ class UserRepository(BaseRepository[User]):
         :param join_: Join relations.
         :return: User.
         """
-        query = await self._query(join_)
-        query = query.filter(User.username == username)
+        query = self._query(join_)
+        query = await self._get_by(query, "username", username)
 
         if join_ is not None:
-            return await self.all_unique(query)
+            return await self._one_or_none_unique(query)
 
         return await self._one_or_none(query)
 
     async def get_by_email(
-        self, email: str, join_: set[str] | None = None
+        self, email: str, join_: set[str] | dict[str, str] | None = None
     ) -> User | None:
         """
         Get user by email.
@@ -38,21 +38,10 @@ class UserRepository(BaseRepository[User]):
         :param join_: Join relations.
         :return: User.
         """
-        query = await self._query(join_)
-        query = query.filter(User.email == email)
+        query = self._query(join_)
+        query = await self._get_by(query, "email", email)
 
         if join_ is not None:
-            return await self.all_unique(query)
-   
-        return await self._one_or_none(query)
+            return await self._one_or_none_unique(query)
 
-    def _join_tasks(self, query: Select) -> Select:
-        """
-        Join tasks.
-
-        :param query: Query.
-        :return: Query.
-        """
-        return query.options(joinedload(User.tasks)).execution_options(
-            contains_joined_collection=True
-        )
+        return await self._one_or_none(query)
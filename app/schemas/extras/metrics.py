@@ -0,0 +1,37 @@
+from pydantic import BaseModel, Field
+
+
+class HistogramSnapshot(BaseModel):
+    buckets: dict[str, int] = Field(
+        ..., description="Cumulative observation count per upper bound"
+    )
+    sum: float = Field(..., description="Sum of all observations")
+    count: int = Field(..., description="Number of observations")
+
+
+class CacheTagMetrics(BaseModel):
+    hits: int = Field(..., example=120)
+    misses: int = Field(..., example=8)
+    hit_ratio: float | None = Field(..., example=0.9375)
+    errors: int = Field(..., example=0)
+    invalidations: int = Field(..., example=3)
+    get_latency: HistogramSnapshot = Field(..., description="Backend read seconds")
+    set_latency: HistogramSnapshot = Field(..., description="Backend write seconds")
+    value_size: HistogramSnapshot = Field(..., description="Encoded value bytes")
+
+
+class PoolStats(BaseModel):
+    size: int = Field(..., example=5)
+    checked_out: int = Field(..., example=3, description="Connections in use")
+    idle: int = Field(..., example=2, description="Connections in the pool")
+    overflow: int = Field(..., example=0, description="Connections beyond size")
+    max_overflow: int = Field(..., example=10)
+    timeouts: int = Field(..., example=0, description="Checkouts that timed out")
+    wait: HistogramSnapshot = Field(..., description="Checkout seconds")
+
+
+class StatementCacheStats(BaseModel):
+    hits: int = Field(..., example=950, description="Statements compiled before")
+    misses: int = Field(..., example=12, description="Statements compiled anew")
+    hit_ratio: float | None = Field(..., example=0.9875)
+    uncached: int = Field(..., example=3, description="Statements not cacheable")
@@ -0,0 +1,25 @@
+from core.cache import Cache
+from core.database import session
+from core.factory import Factory
+
+RECENT_AUTHORS = 100
+
+
+async def recently_active_authors() -> list[dict]:
+    """
+    Returns the argument sets for the authors whose tasks changed most recently.
+    """
+    task_repository = Factory.task_repository(db_session=session)
+    author_ids = await task_repository.get_recent_author_ids(limit=RECENT_AUTHORS)
+    return [{"author_id": author_id} for author_id in author_ids]
+
+
+@Cache.warmup.register(arguments=recently_active_authors)
+async def warm_up_task_lists(author_id: int) -> None:
+    """
+    Populates the cached task list of an author.
+
+    :param author_id: The author id.
+    """
+    task_controller = Factory().get_task_controller(db_session=session)
+    await task_controller.get_by_author_id(author_id)
@@ -0,0 +1,82 @@
+"""
+Compares payload size and encode/decode time of the cache codecs for lists
+of UserResponse and TaskResponse.
+
+    python -m benchmarks.cache_codecs
+"""
+
+import timeit
+from uuid import uuid4
+
+from faker import Faker
+from fastapi.encoders import jsonable_encoder
+
+from app.schemas.responses.tasks import TaskResponse
+from app.schemas.responses.users import UserResponse
+from core.cache.codec import JSONCodec, MsgpackCodec, PickleCodec, Serializer, msgpack
+
+fake = Faker()
+Faker.seed(0)
+
+ROWS = 100
+NUMBER = 200
+
+
+def make_users() -> list[UserResponse]:
+    return [
+        UserResponse(email=fake.email(), username=fake.user_name(), uuid=uuid4())
+        for _ in range(ROWS)
+    ]
+
+
+def make_tasks() -> list[TaskResponse]:
+    return [
+        TaskResponse(
+            title=fake.sentence(),
+            description=fake.paragraph(),
+            is_completed=fake.boolean(),
+            uuid=uuid4(),
+        )
+        for _ in range(ROWS)
+    ]
+
+
+def measure(serializer: Serializer, value) -> tuple[int, float, float]:
+    data = serializer.dumps(value)
+    encode = timeit.timeit(lambda: serializer.dumps(value), number=NUMBER)
+    decode = timeit.timeit(lambda: serializer.loads(data), number=NUMBER)
+    return len(data), encode / NUMBER * 1e6, decode / NUMBER * 1e6
+
+
+def main() -> None:
+    codecs = [("pickle", PickleCodec()), ("json", JSONCodec())]
+    if msgpack is not None:
+        codecs.append(("msgpack", MsgpackCodec()))
+
+    print(f"{ROWS} rows per list, {NUMBER} iterations per measurement\n")
+    print(
+        f"{'payload':<10}{'codec':<16}{'value':<8}"
+        f"{'bytes':>10}{'encode µs':>12}{'decode µs':>12}"
+    )
+    for name, models in (("users", make_users()), ("tasks", make_tasks())):
+        rows = jsonable_encoder(models)
+        for codec_name, codec in codecs:
+            for compress_threshold in (0, 1024):
+                serializer = Serializer(
+                    codec=codec, compress_threshold=compress_threshold
+                )
+                label = f"{codec_name}{'+zlib' if compress_threshold else ''}"
+                values = [("dicts", rows)]
+                if codec_name == "pickle":
+                    values.append(("models", models))
+
+                for value_name, value in values:
+                    size, encode, decode = measure(serializer, value)
+                    print(
+                        f"{name:<10}{label:<16}{value_name:<8}"
+                        f"{size:>10}{encode:>12.1f}{decode:>12.1f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
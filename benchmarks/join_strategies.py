@@ -0,0 +1,134 @@
+"""
+Compares the loading strategies of the join_ mechanism by loading users with
+their tasks: the number of statements, the rows and bytes they return, the
+peak Python memory and the time per load. Joined eager loading repeats every
+user's columns once per task, selectin sends each row once.
+
+Runs against the database at POSTGRES_URL, creating and dropping the tables,
+so point it at an empty database.
+
+    python -m benchmarks.join_strategies
+"""
+
+import asyncio
+import time
+import tracemalloc
+
+from sqlalchemy import event, text
+
+from app.models import User
+from app.repositories import UserRepository
+from core.database import Base
+from core.database.session import async_session_factory, engines
+
+USERS = 200
+TASKS_PER_USER = 100
+REPEAT = 3
+
+STRATEGIES = ("joined", "selectin")
+
+SEED = (
+    f"""
+    INSERT INTO users (uuid, email, username, password, is_admin, created_at,
+                       updated_at)
+    SELECT gen_random_uuid(), 'user' || g || '@example.com', 'user' || g,
+           repeat('x', 60), false, now(), now()
+    FROM generate_series(1, {USERS}) g
+    """,
+    f"""
+    INSERT INTO tasks (uuid, title, description, is_completed, task_author_id,
+                       created_at, updated_at)
+    SELECT gen_random_uuid(), 'Task ' || g, repeat('x', 200), false, u.id,
+           now(), now()
+    FROM users u, generate_series(1, {TASKS_PER_USER}) g
+    """,
+)
+
+
+async def load(join_: dict[str, str], trace: bool) -> tuple[list, float, int]:
+    """
+    Loads every user with its tasks in a new session.
+
+    :param join_: The join with its loading strategy.
+    :param trace: Whether to trace memory, which slows the load down.
+    :return: The statements sent, the seconds taken and the peak memory.
+    """
+    statements = []
+
+    def capture(connection, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = engines["writer"].sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        async with async_session_factory() as session:
+            repository = UserRepository(model=User, db_session=session)
+            if trace:
+                tracemalloc.start()
+            started = time.perf_counter()
+            users = await repository.get_all(limit=USERS, join_=join_)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            assert sum(len(user.tasks) for user in users) == USERS * TASKS_PER_USER
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    return statements, elapsed, peak
+
+
+async def measure_wire(statements: list) -> tuple[int, int]:
+    """
+    Re-runs the statements to measure what they return.
+
+    :param statements: The statements and their parameters.
+    :return: The number of rows and the size of their values in bytes.
+    """
+    rows = size = 0
+    async with engines["writer"].connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        for statement, parameters in statements:
+            count, total = await driver_connection.fetchrow(
+                f"SELECT count(*), sum(pg_column_size(t.*)) FROM ({statement}) t",
+                *parameters,
+            )
+            rows += count
+            size += total or 0
+
+    return rows, size
+
+
+async def main() -> None:
+    async with engines["writer"].begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+        for statement in SEED:
+            await connection.execute(text(statement))
+
+    try:
+        print(f"{USERS} users with {TASKS_PER_USER} tasks each\n")
+        print(
+            f"{'strategy':<12}{'queries':>8}{'rows':>10}{'KiB':>10}"
+            f"{'peak KiB':>12}{'ms/load':>10}"
+        )
+        for strategy in STRATEGIES:
+            join_ = {"tasks": strategy}
+            statements, _, peak = await load(join_, trace=True)
+            timings = []
+            for _ in range(REPEAT):
+                _, elapsed, _ = await load(join_, trace=False)
+                timings.append(elapsed)
+
+            rows, size = await measure_wire(statements)
+            print(
+                f"{strategy:<12}{len(statements):>8}{rows:>10}{size // 1024:>10}"
+                f"{peak // 1024:>12}{min(timings) * 1000:>10.1f}"
+            )
+    finally:
+        async with engines["writer"].begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+        await engines["writer"].dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
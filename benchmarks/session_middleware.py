@@ -0,0 +1,84 @@
+"""
+Compares the per-request overhead of the previous scoped-registry session
+middleware with the lazy SQLAlchemyMiddleware, for requests that never touch
+the database and for requests that create their session.
+
+    python -m benchmarks.session_middleware
+"""
+
+import asyncio
+import time
+from contextvars import ContextVar
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import async_scoped_session
+
+from core.database import session
+from core.database.session import async_session_factory
+from core.fastapi.middlewares import SQLAlchemyMiddleware
+
+NUMBER = 20000
+
+scoped_context: ContextVar[str] = ContextVar("scoped_context")
+scoped_session = async_scoped_session(
+    session_factory=async_session_factory, scopefunc=scoped_context.get
+)
+
+SCOPE = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+
+class ScopedSessionMiddleware:
+    """
+    The middleware as it was before sessions were created lazily.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        context = scoped_context.set(str(uuid4()))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            await scoped_session.remove()
+            scoped_context.reset(context)
+
+
+async def receive():
+    return {"type": "http.request"}
+
+
+async def send(message):
+    pass
+
+
+def make_app(proxy, touch: bool):
+    async def app(scope, receive, send):
+        if touch:
+            proxy.info  # pylint: disable=pointless-statement
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    return app
+
+
+async def measure(middleware) -> float:
+    started = time.perf_counter()
+    for _ in range(NUMBER):
+        await middleware(SCOPE, receive, send)
+    return (time.perf_counter() - started) / NUMBER * 1e6
+
+
+async def main() -> None:
+    print(f"{NUMBER} requests per measurement\n")
+    print(f"{'middleware':<12}{'database':<12}{'µs/request':>12}")
+    for touch in (False, True):
+        label = "used" if touch else "unused"
+        before = ScopedSessionMiddleware(make_app(scoped_session, touch))
+        after = SQLAlchemyMiddleware(make_app(session, touch))
+        print(f"{'scoped':<12}{label:<12}{await measure(before):>12.2f}")
+        print(f"{'lazy':<12}{label:<12}{await measure(after):>12.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
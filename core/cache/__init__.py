@@ -1,11 +1,22 @@
 from .cache_manager import Cache
 from .cache_tag import CacheTag
+from .codec import JSONCodec, MsgpackCodec, PickleCodec, Serializer
 from .custom_key_maker import CustomKeyMaker
+from .memory_backend import MemoryBackend
+from .metrics import CacheMetrics
 from .redis_backend import RedisBackend
+from .tiered_backend import TieredBackend
 
 __all__ = [
     "Cache",
     "RedisBackend",
+    "MemoryBackend",
+    "TieredBackend",
     "CustomKeyMaker",
     "CacheTag",
+    "CacheMetrics",
+    "Serializer",
+    "JSONCodec",
+    "MsgpackCodec",
+    "PickleCodec",
 ]
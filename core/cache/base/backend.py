@@ -11,6 +11,22 @@ class BaseBackend(ABC):
     async def set(self, response: Any, key: str, ttl: int = 60) -> None:
         ...
 
+    @abstractmethod
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        """Returns the values of the keys that exist, keyed by key."""
+
+    @abstractmethod
+    async def set_many(self, responses: dict[str, Any], ttl: int = 60) -> None:
+        ...
+
+    @abstractmethod
+    async def add(self, response: Any, key: str, ttl: int = 60) -> bool:
+        """Sets the key only if it does not exist yet and reports whether it did."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        ...
+
     @abstractmethod
     async def delete_startswith(self, value: str) -> None:
         ...
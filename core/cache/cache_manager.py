@@ -1,47 +1,446 @@
-from functools import wraps
-from typing import Type
+import asyncio
+import inspect
+import math
+import random
+import time
+from dataclasses import dataclass
+from functools import partial, wraps
+from typing import Any, Awaitable, Callable, Type
+
+from core.database import after_commit, standalone_session
 
 from .base import BaseBackend, BaseKeyMaker
 from .cache_tag import CacheTag
+from .codec import Serializer
+from .metrics import CacheMetrics, metrics
+from .warmup import WarmupRegistry, refreshing
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    A cached value along with what is needed to refresh it ahead of time.
+
+    :param value: The cached value.
+    :param expires_at: Unix time after which the value is stale.
+    :param delta: Seconds it took to compute the value.
+    """
+
+    value: Any
+    expires_at: float
+    delta: float
+
+    def is_fresh(self, beta: float = 0) -> bool:
+        """
+        Returns whether the entry can be served without a refresh. With a
+        positive beta the entry expires early with a probability that grows
+        as the expiry nears and with the cost of computing it (XFetch).
+        """
+        now = time.time()
+        if beta:
+            now -= self.delta * beta * math.log(1.0 - random.random())
+
+        return now < self.expires_at
 
 
 class CacheManager:
-    def __init__(self):
+    """
+    Caches coroutine results in a backend. Backend failures are recorded in
+    the metrics and treated as misses so they never fail the call itself.
+    """
+
+    def __init__(self, cache_metrics: CacheMetrics = metrics):
         self.backend = None
         self.key_maker = None
+        self.metrics = cache_metrics
+        self.warmup = WarmupRegistry()
+        self.serializer = Serializer.from_config()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._refreshes: set[asyncio.Task] = set()
 
     def init(self, backend: Type[BaseBackend], key_maker: Type[BaseKeyMaker]) -> None:
         self.backend = backend
         self.key_maker = key_maker
 
-    def cached(self, prefix: str = None, tag: CacheTag = None, ttl: int = 60):
+    def cached(
+        self,
+        prefix: str = None,
+        tag: CacheTag = None,
+        ttl: int = 60,
+        lock: bool = False,
+        lock_timeout: int = 10,
+        beta: float = 0,
+        stale_ttl: int = 0,
+    ):
+        """
+        Caches the result of the decorated coroutine.
+
+        Concurrent misses for the same key within a process always share a
+        single call of the function.
+
+        :param prefix: The key prefix, used instead of the tag if given.
+        :param tag: The tag to group the keys under.
+        :param ttl: Seconds the value is considered fresh.
+        :param lock: Whether to also coalesce misses across processes with a
+            lock held in the backend.
+        :param lock_timeout: Seconds the lock is held for at most.
+        :param beta: Refresh values early with the XFetch algorithm. 1.0 is a
+            sensible value, larger values refresh earlier and 0 disables it.
+        :param stale_ttl: Seconds past ttl during which the stale value is
+            served while a single background task refreshes it.
+        """
+
         def _cached(function):
+            signature = None
+            if not prefix and tag.parameters:
+                signature = inspect.signature(function)
+
             @wraps(function)
             async def __cached(*args, **kwargs):
-                if not self.backend or not self.key_maker:
+                if self.backend is None or self.key_maker is None:
                     raise ValueError("Backend or KeyMaker not initialized")
 
                 key = await self.key_maker.make(
                     function=function,
-                    prefix=prefix if prefix else tag.value,
+                    prefix=self._resolve_prefix(prefix, tag, signature, args, kwargs),
+                    args=args,
+                    kwargs=kwargs,
                 )
-                cached_response = await self.backend.get(key=key)
-                if cached_response:
+
+                async def load():
+                    started = time.perf_counter()
+                    response = await function(*args, **kwargs)
+                    await self._store(
+                        key=key,
+                        response=response,
+                        delta=time.perf_counter() - started,
+                        ttl=ttl,
+                        stale_ttl=stale_ttl,
+                        envelope=bool(beta or stale_ttl),
+                    )
+                    return response
+
+                loader = load
+                if lock:
+                    loader = partial(self._load_locked, key, load, lock_timeout)
+
+                if refreshing.get():
+                    return await self._single_flight(key, loader)
+
+                cached_response = await self._get(key)
+                if cached_response is None:
+                    return await self._single_flight(key, loader)
+                if not isinstance(cached_response, CacheEntry):
                     return cached_response
+                if cached_response.is_fresh(beta):
+                    return cached_response.value
+                if stale_ttl:
+                    self._refresh_in_background(key, loader)
+                    return cached_response.value
 
-                response = await function(*args, **kwargs)
-                await self.backend.set(response=response, key=key, ttl=ttl)
-                return response
+                return await self._single_flight(key, loader)
 
             return __cached
 
         return _cached
 
-    async def remove_by_tag(self, tag: CacheTag) -> None:
-        await self.backend.delete_startswith(value=tag.value)
+    def cached_many(
+        self,
+        prefix: str = None,
+        tag: CacheTag = None,
+        ttl: int = 60,
+        argument: str = "ids",
+        id_attribute: str = "id",
+    ):
+        """
+        Caches the items returned by a coroutine that looks up a collection of
+        ids, one cache entry per id. Only the ids missing from the cache are
+        passed on to the function and its results are stored in one batch.
+
+        The decorated function returns a list of items and the wrapper returns
+        the cached and loaded items in the order of the requested ids. Ids the
+        function returned nothing for are left out and not cached.
+
+        :param prefix: The key prefix, used instead of the tag if given.
+        :param tag: The tag to group the keys under.
+        :param ttl: Seconds the items are cached for.
+        :param argument: The name of the parameter holding the ids.
+        :param id_attribute: The attribute holding the id of a returned item.
+        """
+
+        def _cached_many(function):
+            signature = inspect.signature(function)
+
+            @wraps(function)
+            async def __cached_many(*args, **kwargs):
+                if self.backend is None or self.key_maker is None:
+                    raise ValueError("Backend or KeyMaker not initialized")
+
+                arguments = signature.bind(*args, **kwargs)
+                arguments.apply_defaults()
+                ids = list(dict.fromkeys(arguments.arguments[argument]))
+                if not ids:
+                    return []
+
+                resolved_prefix = self._resolve_prefix(
+                    prefix,
+                    tag,
+                    signature if tag and tag.parameters else None,
+                    args,
+                    kwargs,
+                )
+                keys = {}
+                for id_ in ids:
+                    arguments.arguments[argument] = [id_]
+                    keys[id_] = await self.key_maker.make(
+                        function=function,
+                        prefix=resolved_prefix,
+                        args=arguments.args,
+                        kwargs=arguments.kwargs,
+                    )
+
+                cached_responses = await self._get_many(list(keys.values()))
+                items = {
+                    id_: cached_responses[key]
+                    for id_, key in keys.items()
+                    if key in cached_responses
+                }
+
+                missing = [id_ for id_ in ids if id_ not in items]
+                if missing:
+                    arguments.arguments[argument] = missing
+                    response = await function(*arguments.args, **arguments.kwargs)
+                    loaded = {
+                        getattr(item, id_attribute): item
+                        for item in response
+                        if getattr(item, id_attribute) in keys
+                    }
+                    await self._set_many(
+                        {keys[id_]: item for id_, item in loaded.items()}, ttl
+                    )
+                    items.update(loaded)
+
+                return [items[id_] for id_ in ids if id_ in items]
+
+            return __cached_many
+
+        return _cached_many
+
+    async def get(self, key: str) -> Any:
+        """
+        Returns the value cached under the key, or None if there is none.
+        """
+        if self.backend is None:
+            return None
+
+        cached_response = await self._get(key)
+        if isinstance(cached_response, CacheEntry):
+            return cached_response.value
+
+        return cached_response
+
+    async def set(self, response: Any, key: str, ttl: int = 60) -> None:
+        """
+        Caches the value under the key.
+        """
+        if self.backend is not None:
+            await self._set(key, response, ttl)
+
+    async def remove_by_tag(self, tag: CacheTag, **params: Any) -> None:
+        await self.remove_by_prefix(prefix=tag.format(**params))
+
+    def remove_by_tag_on_commit(
+        self, session: Any, tag: CacheTag, **params: Any
+    ) -> None:
+        """
+        Removes the tag's keys once the session's transaction commits, so no
+        read can cache the data from before the commit again. Nothing is
+        removed if the transaction is rolled back.
+
+        :param session: The session of the transaction.
+        :param tag: The tag to remove.
+        :param params: The tag parameters.
+        """
+        prefix = tag.format(**params)
+        after_commit(session, partial(self.remove_by_prefix, prefix), key=prefix)
 
     async def remove_by_prefix(self, prefix: str) -> None:
-        await self.backend.delete_startswith(value=prefix)
+        # Nothing can have been cached without a backend.
+        if self.backend is None:
+            return
+
+        self.metrics.invalidation(prefix)
+        try:
+            await self.backend.delete_startswith(value=prefix)
+        except Exception:
+            self.metrics.error(prefix)
+            raise
+
+    async def _get(self, key: str) -> Any:
+        started = time.perf_counter()
+        try:
+            response = await self.backend.get(key=key)
+        except Exception:  # pylint: disable=broad-except
+            self.metrics.error(key)
+            return None
+
+        self.metrics.observe_get(key, time.perf_counter() - started)
+        if response is None:
+            self.metrics.miss(key)
+        else:
+            self.metrics.hit(key)
+
+        return response
+
+    async def _get_many(self, keys: list[str]) -> dict[str, Any]:
+        started = time.perf_counter()
+        try:
+            responses = await self.backend.get_many(keys=keys)
+        except Exception:  # pylint: disable=broad-except
+            self.metrics.error(keys[0])
+            return {}
+
+        self.metrics.observe_get(keys[0], time.perf_counter() - started)
+        self.metrics.hit(keys[0], count=len(responses))
+        self.metrics.miss(keys[0], count=len(keys) - len(responses))
+        return responses
+
+    async def _set(self, key: str, response: Any, ttl: int) -> None:
+        started = time.perf_counter()
+        try:
+            await self.backend.set(response=response, key=key, ttl=ttl)
+        except Exception:  # pylint: disable=broad-except
+            self.metrics.error(key)
+            return
+
+        self.metrics.observe_set(key, time.perf_counter() - started)
+
+    async def _set_many(self, responses: dict[str, Any], ttl: int) -> None:
+        if not responses:
+            return
+
+        key = next(iter(responses))
+        started = time.perf_counter()
+        try:
+            await self.backend.set_many(responses=responses, ttl=ttl)
+        except Exception:  # pylint: disable=broad-except
+            self.metrics.error(key)
+            return
+
+        self.metrics.observe_set(key, time.perf_counter() - started)
+
+    async def _store(
+        self,
+        key: str,
+        response: Any,
+        delta: float,
+        ttl: int,
+        stale_ttl: int,
+        envelope: bool,
+    ) -> None:
+        if not envelope:
+            await self._set(key, response, ttl)
+            return
+
+        entry = CacheEntry(value=response, expires_at=time.time() + ttl, delta=delta)
+        await self._set(key, entry, ttl + stale_ttl)
+
+    async def _single_flight(self, key: str, loader: Callable[[], Awaitable]) -> Any:
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                response = await asyncio.shield(future)
+                # The loader's result may hold ORM instances attached to its
+                # session, so every waiter gets a copy of its own.
+                return self.serializer.loads(self.serializer.dumps(response))
+            except asyncio.CancelledError:
+                # The caller that was loading the value went away, load it here.
+                if not future.cancelled():
+                    raise
+
+        future = self._inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exception:
+            future.set_exception(exception)
+            # Mark the exception as retrieved in case nobody else awaited it.
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _load_locked(
+        self, key: str, load: Callable[[], Awaitable], lock_timeout: int
+    ) -> Any:
+        lock_key = f"{key}::lock"
+        try:
+            locked = await self.backend.add(response=1, key=lock_key, ttl=lock_timeout)
+        except Exception:  # pylint: disable=broad-except
+            self.metrics.error(key)
+            return await load()
+
+        if locked:
+            try:
+                return await load()
+            finally:
+                try:
+                    await self.backend.delete(key=lock_key)
+                except Exception:  # pylint: disable=broad-except
+                    self.metrics.error(key)
+
+        # Another process is loading the value, wait for it to show up.
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+            try:
+                cached_response = await self.backend.get(key=key)
+            except Exception:  # pylint: disable=broad-except
+                self.metrics.error(key)
+                break
+            if isinstance(cached_response, CacheEntry):
+                return cached_response.value
+            if cached_response is not None:
+                return cached_response
+
+        return await load()
+
+    def _refresh_in_background(self, key: str, loader: Callable[[], Awaitable]) -> None:
+        if key in self._inflight:
+            return
+
+        # The request that triggered the refresh may finish before it does,
+        # so the refresh gets its own database session.
+        refresh = standalone_session(self._single_flight)
+        task = asyncio.create_task(refresh(key, loader))
+        self._refreshes.add(task)
+        task.add_done_callback(self._refreshes.discard)
+        task.add_done_callback(lambda task: task.cancelled() or task.exception())
+
+    @staticmethod
+    def _resolve_prefix(
+        prefix: str | None,
+        tag: CacheTag | None,
+        signature: inspect.Signature | None,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> str:
+        if prefix:
+            return prefix
+        if signature is None:
+            return tag.value
+
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        return tag.format(
+            **{name: arguments.arguments[name] for name in tag.parameters}
+        )
 
 
 Cache = CacheManager()
@@ -1,5 +1,18 @@
 from enum import Enum
+from string import Formatter
+from typing import Any
 
 
 class CacheTag(Enum):
     GET_USER_LIST = "get_user_list"
+    GET_TASK_LIST_BY_AUTHOR = "get_task_list_by_author:{author_id}"
+    GET_TASK = "get_task:{task_uuid}"
+    NOT_FOUND = "not_found:{table}"
+    COUNT = "count:{table}"
+
+    @property
+    def parameters(self) -> tuple[str, ...]:
+        return tuple(name for _, name, _, _ in Formatter().parse(self.value) if name)
+
+    def format(self, **params: Any) -> str:
+        return self.value.format(**params)
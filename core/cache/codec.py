@@ -0,0 +1,137 @@
+import pickle
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any
+
+import ujson
+
+from core.config import config
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+COMPRESSED = 0x80
+
+
+class BaseCodec(ABC):
+    format: int
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        ...
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        ...
+
+
+class JSONCodec(BaseCodec):
+    format = 1
+
+    def dumps(self, value: Any) -> bytes:
+        return ujson.dumps(value, ensure_ascii=False).encode("utf8")
+
+    def loads(self, data: bytes) -> Any:
+        return ujson.loads(data)
+
+
+class MsgpackCodec(BaseCodec):
+    format = 2
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack must be installed to use MsgpackCodec")
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, strict_map_key=False)
+
+
+class PickleCodec(BaseCodec):
+    format = 3
+
+    def dumps(self, value: Any) -> bytes:
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, data: bytes) -> Any:
+        return pickle.loads(data)
+
+
+CODECS = {
+    "json": JSONCodec,
+    "msgpack": MsgpackCodec,
+    "pickle": PickleCodec,
+}
+
+
+class Serializer:
+    """
+    Encodes cache values with a codec and prefixes them with a header byte
+    naming the codec and whether the payload is zlib compressed, so decoding
+    never has to guess the format.
+
+    Without a codec dicts are stored as JSON and everything else is pickled.
+    Values the chosen codec cannot encode are pickled as well.
+    """
+
+    def __init__(
+        self,
+        codec: BaseCodec | None = None,
+        compress_threshold: int = 1024,
+        compress_level: int = 1,
+    ):
+        self.codec = codec
+        self.compress_threshold = compress_threshold
+        self.compress_level = compress_level
+        self.json = JSONCodec()
+        self.pickle = PickleCodec()
+        self.codecs: dict[int, BaseCodec] = {
+            self.json.format: self.json,
+            self.pickle.format: self.pickle,
+        }
+        if msgpack is not None:
+            self.codecs[MsgpackCodec.format] = MsgpackCodec()
+        if codec is not None:
+            self.codecs[codec.format] = codec
+
+    @classmethod
+    def from_config(cls) -> "Serializer":
+        codec = None
+        if config.CACHE_CODEC != "auto":
+            codec = CODECS[config.CACHE_CODEC]()
+
+        return cls(codec=codec, compress_threshold=config.CACHE_COMPRESS_THRESHOLD)
+
+    def dumps(self, value: Any) -> bytes:
+        codec = self.codec
+        if codec is None:
+            codec = self.json if isinstance(value, dict) else self.pickle
+
+        try:
+            payload = codec.dumps(value)
+        except (TypeError, ValueError, OverflowError):
+            codec = self.pickle
+            payload = codec.dumps(value)
+
+        header = codec.format
+        if self.compress_threshold and len(payload) >= self.compress_threshold:
+            compressed = zlib.compress(payload, self.compress_level)
+            if len(compressed) < len(payload):
+                payload, header = compressed, header | COMPRESSED
+
+        return bytes((header,)) + payload
+
+    def loads(self, data: bytes) -> Any:
+        header, payload = data[0], data[1:]
+        if header & COMPRESSED:
+            payload = zlib.decompress(payload)
+
+        codec = self.codecs.get(header & ~COMPRESSED)
+        if codec is None:
+            raise ValueError(f"Unknown cache value format: {header}")
+
+        return codec.loads(payload)
@@ -1,18 +1,147 @@
+import hashlib
 import inspect
-from typing import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Callable
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.requests import HTTPConnection
 
 from core.cache.base import BaseKeyMaker
+from core.database.session import SessionProxy
+
+SKIPPED_NAMES = {"self", "cls"}
+SKIPPED_TYPES = (AsyncSession, SessionProxy, Session, HTTPConnection)
+
+
+@dataclass(frozen=True)
+class FunctionSignature:
+    path: str
+    positional: tuple[str, ...]
+    defaults: dict[str, Any]
+    skipped: frozenset[str]
+    bound_to_instance: bool
 
 
 class CustomKeyMaker(BaseKeyMaker):
-    async def make(self, function: Callable, prefix: str) -> str:
-        path = f"{prefix}::{inspect.getmodule(function).__name__}.{function.__name__}"
-        args = ""
+    """
+    Builds keys of the form ``{prefix}::{module}.{qualname}:{digest}`` where
+    the digest is a hash of the canonically encoded argument values.
+
+    The function path and signature are worked out once per function, so
+    making a key only costs binding and hashing the arguments.
+    """
+
+    def __init__(self):
+        self._signatures: dict[Callable, FunctionSignature] = {}
+
+    async def make(
+        self,
+        function: Callable,
+        prefix: str,
+        args: tuple[Any, ...] = (),
+        kwargs: dict[str, Any] | None = None,
+    ) -> str:
+        signature = self._signatures.get(function)
+        if signature is None:
+            signature = self._signatures[function] = self.describe(function)
+
+        path = f"{prefix}::{signature.path}"
+        if signature.bound_to_instance and args:
+            path = f"{path}@{type(args[0]).__qualname__}"
+
+        arguments = self._bind(signature, args, kwargs or {})
+        if not arguments:
+            return path
+
+        digest = hashlib.blake2b(
+            encode(arguments).encode("utf8"), digest_size=16
+        ).hexdigest()
+        return f"{path}:{digest}"
+
+    @staticmethod
+    def describe(function: Callable) -> FunctionSignature:
+        """
+        Returns the precomputed signature of the function.
+
+        :param function: The function to inspect.
+        :return: The function signature.
+        """
+        function = inspect.unwrap(function)
+        positional, defaults, skipped = [], {}, set()
+
+        for parameter in inspect.signature(function).parameters.values():
+            if parameter.kind in (parameter.VAR_POSITIONAL, parameter.VAR_KEYWORD):
+                continue
+
+            if parameter.kind != parameter.KEYWORD_ONLY:
+                positional.append(parameter.name)
+            if parameter.default is not parameter.empty:
+                defaults[parameter.name] = parameter.default
+
+            annotation = parameter.annotation
+            if parameter.name in SKIPPED_NAMES or (
+                isinstance(annotation, type) and issubclass(annotation, SKIPPED_TYPES)
+            ):
+                skipped.add(parameter.name)
+
+        return FunctionSignature(
+            path=f"{function.__module__}.{function.__qualname__}",
+            positional=tuple(positional),
+            defaults=defaults,
+            skipped=frozenset(skipped),
+            bound_to_instance=bool(positional) and positional[0] in SKIPPED_NAMES,
+        )
+
+    @staticmethod
+    def _bind(
+        signature: FunctionSignature, args: tuple[Any, ...], kwargs: dict[str, Any]
+    ) -> list[tuple[str, Any]]:
+        bound = dict(signature.defaults)
+        bound.update(zip(signature.positional, args))
+        if len(args) > len(signature.positional):
+            bound["*"] = args[len(signature.positional) :]
+        bound.update(kwargs)
+
+        return [
+            (name, bound[name])
+            for name in sorted(bound)
+            if name not in signature.skipped
+            and not isinstance(bound[name], SKIPPED_TYPES)
+        ]
+
 
-        for arg in inspect.signature(function).parameters.values():
-            args += arg.name
+def encode(value: Any) -> str:
+    """
+    Encodes the value into a string that is stable across processes and
+    equal for equal values. Other types have no such encoding, and their
+    repr usually embeds a memory address, so they are rejected.
 
-        if args:
-            return f"{path}.{args}"
+    :param value: The value to encode.
+    :return: The canonical encoding.
+    :raises TypeError: If the value's type cannot be encoded.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, Enum):
+        return f"{type(value).__name__}.{encode(value.value)}"
+    if isinstance(value, (UUID, datetime, date, time, timedelta, Decimal)):
+        return f"{type(value).__name__}({value})"
+    if isinstance(value, (list, tuple)):
+        return f"[{','.join(encode(item) for item in value)}]"
+    if isinstance(value, (set, frozenset)):
+        return f"{{{','.join(sorted(encode(item) for item in value))}}}"
+    if isinstance(value, dict):
+        items = sorted(f"{encode(k)}:{encode(v)}" for k, v in value.items())
+        return f"{{{','.join(items)}}}"
+    if isinstance(value, BaseModel):
+        return f"{type(value).__name__}{encode(value.dict())}"
 
-        return path
+    raise TypeError(
+        f"Cannot build a cache key from a {type(value).__qualname__} argument"
+    )
@@ -0,0 +1,227 @@
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from core.cache.base import BaseBackend
+from core.cache.codec import Serializer
+from core.cache.metrics import metrics
+from core.config import config
+
+
+@dataclass(slots=True)
+class MemoryEntry:
+    data: bytes
+    expires_at: float
+    size: int
+
+
+class LRUPolicy:
+    """Evicts the least recently used key."""
+
+    def __init__(self):
+        self._keys: OrderedDict[str, None] = OrderedDict()
+
+    def add(self, key: str) -> None:
+        self._keys[key] = None
+        self._keys.move_to_end(key)
+
+    def touch(self, key: str) -> None:
+        self._keys.move_to_end(key)
+
+    def remove(self, key: str) -> None:
+        self._keys.pop(key, None)
+
+    def victim(self) -> str:
+        return next(iter(self._keys))
+
+
+class LFUPolicy:
+    """
+    Evicts the least frequently used key, and the least recently used one
+    among keys used equally often. Adding, touching and evicting are O(1).
+    """
+
+    def __init__(self):
+        self._frequencies: dict[str, int] = {}
+        self._buckets: defaultdict[int, OrderedDict[str, None]] = defaultdict(
+            OrderedDict
+        )
+        self._min_frequency = 0
+
+    def add(self, key: str) -> None:
+        if key in self._frequencies:
+            self.touch(key)
+            return
+
+        self._frequencies[key] = 1
+        self._buckets[1][key] = None
+        self._min_frequency = 1
+
+    def touch(self, key: str) -> None:
+        frequency = self._frequencies[key]
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency:
+                self._min_frequency = frequency + 1
+
+        self._frequencies[key] = frequency + 1
+        self._buckets[frequency + 1][key] = None
+
+    def remove(self, key: str) -> None:
+        frequency = self._frequencies.pop(key, None)
+        if frequency is None:
+            return
+
+        bucket = self._buckets[frequency]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[frequency]
+            if self._min_frequency == frequency and self._buckets:
+                self._min_frequency = min(self._buckets)
+
+    def victim(self) -> str:
+        return next(iter(self._buckets[self._min_frequency]))
+
+
+POLICIES = {
+    "lru": LRUPolicy,
+    "lfu": LFUPolicy,
+}
+
+
+class MemoryBackend(BaseBackend):
+    """
+    Keeps encoded values in process memory within a byte budget.
+
+    Values are evicted with an LRU or LFU policy once the budget is exceeded.
+    Expired keys are dropped by an expiry wheel with one slot per second that
+    is advanced on every call, and keys are indexed by prefix so
+    delete_startswith never scans the whole keyspace.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = config.CACHE_MEMORY_MAX_BYTES,
+        policy: str = config.CACHE_MEMORY_POLICY,
+        serializer: Serializer | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.serializer = serializer or Serializer.from_config()
+        self._entries: dict[str, MemoryEntry] = {}
+        self._policy = POLICIES[policy]()
+        self._prefixes: defaultdict[str, set[str]] = defaultdict(set)
+        self._wheel: defaultdict[int, set[str]] = defaultdict(set)
+        self._wheel_position = int(time.monotonic())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> Any:
+        entry = self._lookup(key)
+        if entry is None:
+            return
+
+        return self.serializer.loads(entry.data)
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        responses = {}
+        for key in keys:
+            entry = self._lookup(key)
+            if entry is not None:
+                responses[key] = self.serializer.loads(entry.data)
+
+        return responses
+
+    async def set(self, response: Any, key: str, ttl: int = 60) -> None:
+        data = self.serializer.dumps(response)
+        metrics.observe_size(key, len(data))
+        self._store(key, data, ttl)
+
+    async def set_many(self, responses: dict[str, Any], ttl: int = 60) -> None:
+        for key, response in responses.items():
+            await self.set(response=response, key=key, ttl=ttl)
+
+    async def add(self, response: Any, key: str, ttl: int = 60) -> bool:
+        if self._lookup(key) is not None:
+            return False
+
+        self._store(key, self.serializer.dumps(response), ttl)
+        return key in self._entries
+
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+
+    async def delete_startswith(self, value: str) -> None:
+        for key in self._prefixes.pop(value, ()):
+            self._remove(key, unindex=False)
+
+    def _lookup(self, key: str) -> MemoryEntry | None:
+        now = time.monotonic()
+        self._expire(now)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove(key)
+            return None
+
+        self._policy.touch(key)
+        return entry
+
+    def _store(self, key: str, data: bytes, ttl: int) -> None:
+        now = time.monotonic()
+        self._expire(now)
+        self._remove(key)
+
+        size = len(key) + len(data)
+        if ttl <= 0 or size > self.max_bytes:
+            return
+
+        while self.size + size > self.max_bytes:
+            self._remove(self._policy.victim())
+
+        entry = MemoryEntry(data=data, expires_at=now + ttl, size=size)
+        self._entries[key] = entry
+        self.size += size
+        self._policy.add(key)
+        self._prefixes[key.split("::", 1)[0]].add(key)
+        self._wheel[int(entry.expires_at)].add(key)
+
+    def _remove(self, key: str, unindex: bool = True) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        self.size -= entry.size
+        self._policy.remove(key)
+        self._wheel.get(int(entry.expires_at), set()).discard(key)
+        if unindex:
+            prefix = key.split("::", 1)[0]
+            keys = self._prefixes.get(prefix)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._prefixes[prefix]
+
+    def _expire(self, now: float) -> None:
+        position = int(now)
+        if position <= self._wheel_position:
+            return
+
+        # After a long idle period it is cheaper to visit the occupied slots
+        # than every second that has passed.
+        if position - self._wheel_position > len(self._wheel):
+            slots = sorted(slot for slot in self._wheel if slot < position)
+        else:
+            slots = range(self._wheel_position, position)
+
+        for slot in slots:
+            for key in self._wheel.pop(slot, ()):
+                self._remove(key)
+
+        self._wheel_position = position
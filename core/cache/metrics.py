@@ -0,0 +1,79 @@
+from collections import defaultdict
+from typing import Any
+
+from core.utils.histogram import Histogram
+
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class TagMetrics:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations = 0
+        self.get_latency = Histogram(LATENCY_BUCKETS)
+        self.set_latency = Histogram(LATENCY_BUCKETS)
+        self.value_size = Histogram(SIZE_BUCKETS)
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "errors": self.errors,
+            "invalidations": self.invalidations,
+            "get_latency": self.get_latency.snapshot(),
+            "set_latency": self.set_latency.snapshot(),
+            "value_size": self.value_size.snapshot(),
+        }
+
+
+def label_of(key: str) -> str:
+    """
+    Returns the metrics label of a key or prefix, which is its tag without
+    any parameters, e.g. ``get_task_list_by_author`` for
+    ``get_task_list_by_author:1::app.controllers.task...``.
+    """
+    return key.split("::", 1)[0].split(":", 1)[0]
+
+
+class CacheMetrics:
+    """
+    In-process cache counters and histograms labeled by tag or prefix.
+    """
+
+    def __init__(self):
+        self.tags: defaultdict[str, TagMetrics] = defaultdict(TagMetrics)
+
+    def hit(self, key: str, count: int = 1) -> None:
+        self.tags[label_of(key)].hits += count
+
+    def miss(self, key: str, count: int = 1) -> None:
+        self.tags[label_of(key)].misses += count
+
+    def error(self, key: str) -> None:
+        self.tags[label_of(key)].errors += 1
+
+    def invalidation(self, key: str) -> None:
+        self.tags[label_of(key)].invalidations += 1
+
+    def observe_get(self, key: str, seconds: float) -> None:
+        self.tags[label_of(key)].get_latency.observe(seconds)
+
+    def observe_set(self, key: str, seconds: float) -> None:
+        self.tags[label_of(key)].set_latency.observe(seconds)
+
+    def observe_size(self, key: str, size: int) -> None:
+        self.tags[label_of(key)].value_size.observe(size)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {label: tag.snapshot() for label, tag in sorted(self.tags.items())}
+
+    def reset(self) -> None:
+        self.tags.clear()
+
+
+metrics = CacheMetrics()
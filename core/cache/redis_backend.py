@@ -1,34 +1,106 @@
-import pickle
 from typing import Any
 
 import redis.asyncio as aioredis
-import ujson
 
 from core.cache.base import BaseBackend
+from core.cache.codec import Serializer
+from core.cache.metrics import metrics
 from core.config import config
 
-redis = aioredis.from_url(url=config.REDIS_URL)
+# Stores the value and records its key in the index of its prefix, a sorted
+# set scored by when each key expires. Members whose keys have expired are
+# pruned on every write, so the index only ever holds live keys. The index
+# itself expires with the last key it points to.
+SET_AND_INDEX = """
+local now = tonumber(redis.call('TIME')[1])
+local ttl = tonumber(ARGV[2])
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ttl)
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+redis.call('ZADD', KEYS[2], now + ttl, KEYS[1])
+if redis.call('TTL', KEYS[2]) < ttl then
+    redis.call('EXPIRE', KEYS[2], ttl)
+end
+"""
+
+# Unlinks every live key recorded in the index, and the index itself.
+UNLINK_INDEXED = """
+local now = tonumber(redis.call('TIME')[1])
+local keys = redis.call('ZRANGEBYSCORE', KEYS[1], now, '+inf')
+for i = 1, #keys, 1000 do
+    redis.call('UNLINK', unpack(keys, i, math.min(i + 999, #keys)))
+end
+redis.call('UNLINK', KEYS[1])
+return #keys
+"""
+
+
+def index_key(prefix: str) -> str:
+    return f"cache-keys::{prefix}"
 
 
 class RedisBackend(BaseBackend):
+    def __init__(
+        self, serializer: Serializer | None = None, url: str = config.REDIS_URL
+    ):
+        self.serializer = serializer or Serializer.from_config()
+        # The client only opens connections once the first command is sent.
+        self.redis = aioredis.from_url(url=url)
+        self._set_and_index = self.redis.register_script(SET_AND_INDEX)
+        self._unlink_indexed = self.redis.register_script(UNLINK_INDEXED)
+
     async def get(self, key: str) -> Any:
-        result = await redis.get(key)
+        result = await self.redis.get(key)
         if not result:
             return
 
         try:
-            return ujson.loads(result.decode("utf8"))
-        except UnicodeDecodeError:
-            return pickle.loads(result)
+            return self.serializer.loads(result)
+        except Exception:  # pylint: disable=broad-except
+            # Undecodable values, e.g. written in an older format, are misses.
+            return
 
     async def set(self, response: Any, key: str, ttl: int = 60) -> None:
-        if isinstance(response, dict):
-            response = ujson.dumps(response)
-        elif isinstance(response, object):
-            response = pickle.dumps(response)
+        prefix = key.split("::", 1)[0]
+        data = self.serializer.dumps(response)
+        metrics.observe_size(key, len(data))
+        await self._set_and_index(keys=[key, index_key(prefix)], args=[data, ttl])
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        if not keys:
+            return {}
+
+        responses = {}
+        for key, result in zip(keys, await self.redis.mget(keys)):
+            if not result:
+                continue
+            try:
+                responses[key] = self.serializer.loads(result)
+            except Exception:  # pylint: disable=broad-except
+                continue
+
+        return responses
+
+    async def set_many(self, responses: dict[str, Any], ttl: int = 60) -> None:
+        if not responses:
+            return
+
+        async with self.redis.pipeline(transaction=False) as pipeline:
+            for key, response in responses.items():
+                prefix = key.split("::", 1)[0]
+                data = self.serializer.dumps(response)
+                metrics.observe_size(key, len(data))
+                await self._set_and_index(
+                    keys=[key, index_key(prefix)], args=[data, ttl], client=pipeline
+                )
+            await pipeline.execute()
+
+    async def add(self, response: Any, key: str, ttl: int = 60) -> bool:
+        return bool(
+            await self.redis.set(key, self.serializer.dumps(response), ex=ttl, nx=True)
+        )
 
-        await redis.set(name=key, value=response, ex=ttl)
+    async def delete(self, key: str) -> None:
+        await self.redis.unlink(key)
 
     async def delete_startswith(self, value: str) -> None:
-        async for key in redis.scan_iter(f"{value}::*"):
-            await redis.delete(key)
+        await self._unlink_indexed(keys=[index_key(value)])
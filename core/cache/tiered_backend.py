@@ -0,0 +1,183 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any
+
+import redis.asyncio as aioredis
+
+from core.cache.base import BaseBackend
+from core.cache.codec import Serializer
+from core.config import config
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache where every entry carries its own expiry.
+    TieredBackend stores encoded values in it, so callers never share the
+    cached objects.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: int = 5):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return _MISSING
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: int) -> None:
+        ttl = min(ttl, self.ttl)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def delete_startswith(self, value: str) -> None:
+        self.generation += 1
+        prefix = f"{value}::"
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+
+class TieredBackend(BaseBackend):
+    """
+    Serves reads from an in-process LocalCache before falling back to the
+    wrapped backend. Local copies are kept encoded and decoded on every read,
+    like MemoryBackend does, so requests never share live objects such as ORM
+    instances attached to another session. Invalidations are broadcast over Redis pub/sub so every
+    worker drops its local copies of the affected prefix.
+    """
+
+    def __init__(
+        self,
+        backend: BaseBackend,
+        max_size: int = config.CACHE_LOCAL_MAX_SIZE,
+        ttl: int = config.CACHE_LOCAL_TTL,
+        channel: str = config.CACHE_INVALIDATION_CHANNEL,
+        serializer: Serializer | None = None,
+    ):
+        self.backend = backend
+        self.serializer = serializer or Serializer.from_config()
+        self.local = LocalCache(max_size=max_size, ttl=ttl)
+        self.channel = channel
+        self.redis = aioredis.from_url(url=config.REDIS_URL)
+        self._listener: asyncio.Task | None = None
+
+    async def get(self, key: str) -> Any:
+        data = self.local.get(key)
+        if data is not _MISSING:
+            return self.serializer.loads(data)
+
+        generation = self.local.generation
+        value = await self.backend.get(key=key)
+        # An invalidation that arrived while we were waiting on the backend
+        # may have made this value stale, so only keep it if none did.
+        if value is not None and generation == self.local.generation:
+            self.local.set(key, self.serializer.dumps(value), self.local.ttl)
+
+        return value
+
+    async def set(self, response: Any, key: str, ttl: int = 60) -> None:
+        await self.backend.set(response=response, key=key, ttl=ttl)
+        self.local.set(key, self.serializer.dumps(response), ttl)
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        responses, missing = {}, []
+        for key in keys:
+            data = self.local.get(key)
+            if data is _MISSING:
+                missing.append(key)
+            else:
+                responses[key] = self.serializer.loads(data)
+
+        if not missing:
+            return responses
+
+        generation = self.local.generation
+        fetched = await self.backend.get_many(keys=missing)
+        if generation == self.local.generation:
+            for key, value in fetched.items():
+                self.local.set(key, self.serializer.dumps(value), self.local.ttl)
+
+        responses.update(fetched)
+        return responses
+
+    async def set_many(self, responses: dict[str, Any], ttl: int = 60) -> None:
+        await self.backend.set_many(responses=responses, ttl=ttl)
+        for key, response in responses.items():
+            self.local.set(key, self.serializer.dumps(response), ttl)
+
+    async def add(self, response: Any, key: str, ttl: int = 60) -> bool:
+        return await self.backend.add(response=response, key=key, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        self.local.delete(key)
+        await self.backend.delete(key=key)
+
+    async def delete_startswith(self, value: str) -> None:
+        self.local.delete_startswith(value)
+        await self.backend.delete_startswith(value=value)
+        await self.redis.publish(self.channel, value)
+
+    async def start(self) -> None:
+        """
+        Starts listening for invalidations broadcast by other workers.
+        """
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """
+        Stops the invalidation listener.
+        """
+        if self._listener is None:
+            return
+
+        self._listener.cancel()
+        try:
+            await self._listener
+        except asyncio.CancelledError:
+            pass
+        self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(self.channel)
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.local.delete_startswith(message["data"].decode("utf8"))
+            except Exception:  # pylint: disable=broad-except
+                # Invalidations may have been missed while disconnected.
+                self.local.clear()
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.close()
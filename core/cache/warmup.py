@@ -0,0 +1,82 @@
+import asyncio
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable
+
+from core.config import config
+from core.database import standalone_session
+
+ArgumentSets = Iterable[dict[str, Any]] | Callable[[], Awaitable[Iterable[dict]]]
+
+# While set, cached functions skip the lookup and recompute their value.
+refreshing: ContextVar[bool] = ContextVar("refreshing", default=False)
+
+
+@dataclass(frozen=True)
+class WarmupJob:
+    function: Callable[..., Awaitable]
+    arguments: ArgumentSets
+
+
+class WarmupRegistry:
+    """
+    Registry of coroutines that populate the cache, along with the keyword
+    arguments to call them with.
+    """
+
+    def __init__(self):
+        self.jobs: list[WarmupJob] = []
+
+    def register(self, arguments: ArgumentSets = ({},)):
+        """
+        Registers the decorated coroutine to be called once per argument set.
+
+        :param arguments: The keyword argument sets, or a coroutine function
+            returning them which is called with its own database session.
+        """
+
+        def _register(function):
+            self.jobs.append(WarmupJob(function=function, arguments=arguments))
+            return function
+
+        return _register
+
+    async def run(
+        self, concurrency: int = config.CACHE_WARMUP_CONCURRENCY, refresh: bool = False
+    ) -> int:
+        """
+        Calls every registered coroutine with each of its argument sets, each
+        call in its own database session. Failures are skipped so warming up
+        never stops the caller.
+
+        :param concurrency: The maximum number of calls running at once.
+        :param refresh: Whether to recompute values that are already cached.
+        :return: The number of calls that succeeded.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(function: Callable[..., Awaitable], kwargs: dict) -> bool:
+            async with semaphore:
+                try:
+                    await standalone_session(function)(**kwargs)
+                except Exception:  # pylint: disable=broad-except
+                    return False
+
+                return True
+
+        context = refreshing.set(refresh)
+        try:
+            calls = []
+            for job in self.jobs:
+                arguments = job.arguments
+                if callable(arguments):
+                    try:
+                        arguments = await standalone_session(arguments)()
+                    except Exception:  # pylint: disable=broad-except
+                        continue
+
+                calls.extend(call(job.function, kwargs) for kwargs in arguments)
+
+            return sum(await asyncio.gather(*calls))
+        finally:
+            refreshing.reset(context)
@@ -1,11 +1,13 @@
-from typing import Any, Generic, Type, TypeVar
+from typing import Any, AsyncIterator, Generic, Type, TypeVar
 from uuid import UUID
 
 from pydantic import BaseModel
+from sqlalchemy import Row
 
+from core.cache import Cache, CacheTag
 from core.database import Base, Propagation, Transactional
-from core.exceptions import NotFoundException
-from core.repository import BaseRepository
+from core.exceptions import BadRequestException, NotFoundException
+from core.repository import BaseRepository, Count
 
 ModelType = TypeVar("ModelType", bound=Base)
 
@@ -13,11 +15,22 @@ ModelType = TypeVar("ModelType", bound=Base)
 class BaseController(Generic[ModelType]):
     """Base class for data controllers."""
 
+    # Seconds to remember that an id or uuid does not exist, 0 disables it.
+    negative_cache_ttl: int = 0
+    # Seconds to reuse a count, 0 disables it.
+    count_cache_ttl: int = 10
+
     def __init__(self, model: Type[ModelType], repository: BaseRepository):
         self.model_class = model
         self.repository = repository
+        if self.negative_cache_ttl:
+            # Inserts must forget the values this controller caches as missing.
+            repository.negative_cache = True
 
-    async def get_by_id(self, id_: int, join_: set[str] | None = None) -> ModelType:
+    @Transactional(propagation=Propagation.READ_ONLY)
+    async def get_by_id(
+        self, id_: int, join_: set[str] | dict[str, str] | None = None
+    ) -> ModelType:
         """
         Returns the model instance matching the id.
 
@@ -26,17 +39,33 @@ class BaseController(Generic[ModelType]):
         :return: The model instance.
         """
 
-        db_obj = await self.repository.get_by(
-            field="id", value=id_, join_=join_, unique=True
-        )
+        # Instances this session already loaded exist, whatever the cache says.
+        if join_ is None and (db_obj := self.repository.loaded("id", id_)):
+            return db_obj
+
+        if await self._is_known_missing("id", id_):
+            raise NotFoundException(
+                f"{self.model_class.__tablename__.title()} with id: {id_} does not exist"
+            )
+
+        if join_ is None:
+            db_obj = await self.repository.load("id", id_)
+        else:
+            db_obj = await self.repository.get_by(
+                field="id", value=id_, join_=join_, unique=True
+            )
         if not db_obj:
+            await self._remember_missing("id", id_)
             raise NotFoundException(
-                f"{self.model_class.__tablename__.title()} with id: {id} does not exist"
+                f"{self.model_class.__tablename__.title()} with id: {id_} does not exist"
             )
 
         return db_obj
 
-    async def get_by_uuid(self, uuid: UUID, join_: set[str] | None = None) -> ModelType:
+    @Transactional(propagation=Propagation.READ_ONLY)
+    async def get_by_uuid(
+        self, uuid: UUID, join_: set[str] | dict[str, str] | None = None
+    ) -> ModelType:
         """
         Returns the model instance matching the uuid.
 
@@ -45,30 +74,120 @@ class BaseController(Generic[ModelType]):
         :return: The model instance.
         """
 
-        db_obj = await self.repository.get_by(
-            field="uuid", value=uuid, join_=join_, unique=True
-        )
+        # Instances this session already loaded exist, whatever the cache says.
+        if join_ is None and (db_obj := self.repository.loaded("uuid", uuid)):
+            return db_obj
+
+        if await self._is_known_missing("uuid", uuid):
+            raise NotFoundException(
+                f"{self.model_class.__tablename__.title()} with id: {uuid} does not exist"
+            )
+
+        if join_ is None:
+            db_obj = await self.repository.load("uuid", uuid)
+        else:
+            db_obj = await self.repository.get_by(
+                field="uuid", value=uuid, join_=join_, unique=True
+            )
         if not db_obj:
+            await self._remember_missing("uuid", uuid)
             raise NotFoundException(
                 f"{self.model_class.__tablename__.title()} with id: {uuid} does not exist"
             )
         return db_obj
 
+    @Transactional(propagation=Propagation.READ_ONLY)
     async def get_all(
-        self, skip: int = 0, limit: int = 100, join_: set[str] | None = None
-    ) -> list[ModelType]:
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        join_: set[str] | dict[str, str] | None = None,
+        fields: set[str] | None = None,
+        rows: bool = False,
+    ) -> list[ModelType] | list[Row]:
         """
         Returns a list of records based on pagination params.
 
         :param skip: The number of records to skip.
         :param limit: The number of records to return.
         :param join_: The joins to make.
+        :param fields: The only columns to load.
+        :param rows: Whether to return plain rows.
         :return: A list of records.
         """
 
-        response = await self.repository.get_all(skip, limit, join_)
+        response = await self.repository.get_all(skip, limit, join_, fields, rows)
         return response
 
+    @Transactional(propagation=Propagation.READ_ONLY)
+    async def get_page(
+        self,
+        after: str | None = None,
+        limit: int = 100,
+        order_by: tuple[str, ...] = ("id",),
+        join_: set[str] | dict[str, str] | None = None,
+        fields: set[str] | None = None,
+        rows: bool = False,
+    ) -> tuple[list[ModelType] | list[Row], str | None]:
+        """
+        Returns a page of records following the cursor.
+
+        :param after: The cursor of the previous page, None for the first page.
+        :param limit: The number of records to return.
+        :param order_by: The ascending ordering columns.
+        :param join_: The joins to make.
+        :param fields: The only columns to load.
+        :param rows: Whether to return plain rows.
+        :return: The records and the cursor of the next page, or None.
+        """
+
+        try:
+            return await self.repository.get_page(
+                after, limit, order_by, join_, fields, rows
+            )
+        except ValueError as exception:
+            raise BadRequestException("Invalid pagination cursor") from exception
+
+    async def count(self, filters: dict[str, Any] | None = None) -> Count:
+        """
+        Returns the number of records matching the filters, exact or estimated
+        for large tables, reusing recent counts for count_cache_ttl seconds.
+
+        :param filters: The fields to match.
+        :return: The number of records and whether it is exact.
+        """
+
+        key = self._count_key(filters or {})
+        if self.count_cache_ttl:
+            cached = await Cache.get(key=key)
+            if cached is not None:
+                return Count(*cached)
+
+        count = await self.repository.count(filters)
+        if self.count_cache_ttl:
+            await Cache.set(response=list(count), key=key, ttl=self.count_cache_ttl)
+
+        return count
+
+    def stream(
+        self,
+        filters: dict[str, Any] | None = None,
+        order_by: tuple[str, ...] = ("id",),
+        fields: set[str] | None = None,
+        rows: bool = False,
+    ) -> AsyncIterator[ModelType] | AsyncIterator[Row]:
+        """
+        Yields the records matching the filters without loading them all.
+
+        :param filters: The fields to match.
+        :param order_by: The ascending ordering columns.
+        :param fields: The only columns to load.
+        :param rows: Whether to yield plain rows.
+        :return: An async iterator of records.
+        """
+
+        return self.repository.stream(filters, order_by, fields=fields, rows=rows)
+
     @Transactional(propagation=Propagation.REQUIRED)
     async def create(self, attributes: dict[str, Any]) -> ModelType:
         """
@@ -80,6 +199,43 @@ class BaseController(Generic[ModelType]):
         create = await self.repository.create(attributes)
         return create
 
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[ModelType]:
+        """
+        Creates new Objects in the DB with multi-row inserts.
+
+        :param rows: The attributes to create each object with.
+        :return: The created objects.
+        """
+        return await self.repository.create_many(rows)
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def upsert_many(
+        self,
+        rows: list[dict[str, Any]],
+        index_elements: list[str],
+        update_fields: list[str] | None = None,
+    ) -> list[ModelType]:
+        """
+        Creates new Objects in the DB, updating the ones that already exist.
+
+        :param rows: The attributes of each object.
+        :param index_elements: The unique columns that identify an object.
+        :param update_fields: The columns to update on existing objects.
+        :return: The created or updated objects.
+        """
+        return await self.repository.upsert_many(rows, index_elements, update_fields)
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def copy_many(self, rows: list[dict[str, Any]]) -> int:
+        """
+        Loads a large number of new Objects into the DB with COPY.
+
+        :param rows: The attributes of each object.
+        :return: The number of objects loaded.
+        """
+        return await self.repository.copy_many(rows)
+
     @Transactional(propagation=Propagation.REQUIRED)
     async def delete(self, model: ModelType) -> bool:
         """
@@ -91,6 +247,82 @@ class BaseController(Generic[ModelType]):
         delete = await self.repository.delete(model)
         return delete
 
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def update_where(
+        self,
+        filters: dict[str, Any],
+        values: dict[str, Any],
+        returning: bool = False,
+        all_rows: bool = False,
+    ) -> list[ModelType] | int:
+        """
+        Updates the Objects matching the filters in the DB without loading them.
+
+        :param filters: The fields to match.
+        :param values: The values to set.
+        :param returning: Whether to return the updated objects.
+        :param all_rows: Whether empty filters may update every object.
+        :return: The updated objects, or how many were updated.
+        """
+        return await self.repository.update_where(
+            filters, values, returning, all_rows=all_rows
+        )
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def delete_where(
+        self,
+        filters: dict[str, Any],
+        returning: bool = False,
+        all_rows: bool = False,
+    ) -> list[ModelType] | int:
+        """
+        Deletes the Objects matching the filters from the DB without loading them.
+
+        :param filters: The fields to match.
+        :param returning: Whether to return the deleted objects.
+        :param all_rows: Whether empty filters may delete every object.
+        :return: The deleted objects, or how many were deleted.
+        """
+        return await self.repository.delete_where(filters, returning, all_rows=all_rows)
+
+    async def _is_known_missing(self, field: str, value: Any) -> bool:
+        """
+        Returns whether the value was recently looked up and not found.
+
+        :param field: The field that was matched.
+        :param value: The value that was matched.
+        :return: True if the value is known not to exist.
+        """
+        if not self.negative_cache_ttl:
+            return False
+
+        return await Cache.get(key=self._missing_key(field, value)) is not None
+
+    async def _remember_missing(self, field: str, value: Any) -> None:
+        """
+        Remembers that the value does not exist for negative_cache_ttl seconds.
+        Creating any instance of the model through the repository forgets it.
+
+        :param field: The field that was matched.
+        :param value: The value that was matched.
+        """
+        if self.negative_cache_ttl:
+            await Cache.set(
+                response=True,
+                key=self._missing_key(field, value),
+                ttl=self.negative_cache_ttl,
+            )
+
+    def _missing_key(self, field: str, value: Any) -> str:
+        prefix = CacheTag.NOT_FOUND.format(table=self.model_class.__tablename__)
+        return f"{prefix}::{field}:{value}"
+
+    def _count_key(self, filters: dict[str, Any]) -> str:
+        prefix = CacheTag.COUNT.format(table=self.model_class.__tablename__)
+        return f"{prefix}::" + ",".join(
+            f"{field}={value!r}" for field, value in sorted(filters.items())
+        )
+
     @staticmethod
     async def extract_attributes_from_schema(
         schema: BaseModel, excludes: set = None
@@ -6,7 +6,7 @@ from .session import (
     set_session_context,
 )
 from .standalone_session import standalone_session
-from .transactional import Propagation, Transactional
+from .transactional import Propagation, Transactional, after_commit
 
 __all__ = [
     "Base",
@@ -17,4 +17,5 @@ __all__ = [
     "standalone_session",
     "Transactional",
     "Propagation",
+    "after_commit",
 ]
@@ -0,0 +1,107 @@
+import time
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.config import config
+from core.utils.histogram import Histogram
+
+from .statements import instrument_statement_cache
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.wait = Histogram(WAIT_BUCKETS)
+        self.timeouts = 0
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited and how many timed
+    out. The metrics survive the pool being recreated on dispose.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.wait.observe(time.perf_counter() - started)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "timeouts": self.metrics.timeouts,
+            "wait": self.metrics.wait.snapshot(),
+        }
+
+
+def connect_args() -> dict[str, Any]:
+    """
+    Returns the asyncpg connection arguments for the prepared statement cache.
+    PgBouncer in transaction mode may hand every statement a different server
+    connection, so prepared statements are neither cached nor reused by name.
+    """
+    if config.POSTGRES_PGBOUNCER:
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+
+    return {
+        "prepared_statement_cache_size": config.POSTGRES_PREPARED_STATEMENT_CACHE_SIZE
+    }
+
+
+def create_engine(url: str) -> AsyncEngine:
+    """
+    Creates an engine whose pool is sized and instrumented from the config.
+
+    :param url: The database url.
+    :return: The engine.
+    """
+    engine = create_async_engine(
+        url,
+        connect_args=connect_args(),
+        poolclass=InstrumentedQueuePool,
+        pool_size=config.POSTGRES_POOL_SIZE,
+        max_overflow=config.POSTGRES_MAX_OVERFLOW,
+        pool_timeout=config.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=config.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=config.POSTGRES_POOL_PRE_PING,
+    )
+    instrument_statement_cache(engine)
+    return engine
+
+
+def pool_stats(engines: dict[str, AsyncEngine]) -> dict[str, dict[str, Any]]:
+    """
+    Returns the live statistics of every instrumented engine pool by name.
+    """
+    return {
+        name: engine.pool.snapshot()
+        for name, engine in engines.items()
+        if isinstance(engine.pool, InstrumentedQueuePool)
+    }
@@ -0,0 +1,164 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from itertools import count
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Seconds the replica is behind its primary, 0 when it has replayed everything
+# it received or is not a standby at all, and the last WAL location it replayed.
+REPLICA_STATUS = text(
+    """
+    SELECT
+        CASE
+            WHEN NOT pg_is_in_recovery() THEN 0
+            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+            ELSE COALESCE(
+                EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+            )
+        END,
+        CASE
+            WHEN pg_is_in_recovery() THEN pg_last_wal_replay_lsn()
+            ELSE pg_current_wal_lsn()
+        END::text
+    """
+)
+
+
+def parse_lsn(value: str) -> int:
+    """
+    Converts a WAL location such as "16/B374D848" to a comparable integer.
+
+    :raises ValueError: If the value is not a WAL location.
+    """
+    high, low = value.split("/")
+    return (int(high, 16) << 32) | int(low, 16)
+
+
+@dataclass
+class Replica:
+    engine: AsyncEngine
+    healthy: bool = True
+    lag: float = 0.0
+    lsn: int = 0
+    latency: float = 0.0
+
+    @property
+    def connections(self) -> int:
+        checkedout = getattr(self.engine.pool, "checkedout", None)
+        return checkedout() if checkedout is not None else 0
+
+
+class ReplicaSet:
+    """
+    Balances reads across the reader engines, leaving out the ones that failed
+    their last health probe, and falls back to the writer when none is left.
+    """
+
+    BALANCING = ("round_robin", "least_connections")
+
+    def __init__(
+        self,
+        writer: AsyncEngine,
+        readers: list[AsyncEngine],
+        balancing: str = "round_robin",
+        max_lag: float = 5,
+        check_interval: float = 5,
+        check_timeout: float = 1,
+    ):
+        if balancing not in self.BALANCING:
+            raise ValueError(f"Unknown balancing strategy {balancing}")
+
+        self.writer = writer
+        self.replicas = [Replica(engine=reader) for reader in readers]
+        self.balancing = balancing
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._counter = count()
+        self._task: asyncio.Task | None = None
+
+    def choose(self, min_lsn: int | None = None) -> AsyncEngine:
+        """
+        Returns the engine the next read should use.
+
+        :param min_lsn: The WAL location the replica must have replayed.
+        """
+        healthy = self._eligible(min_lsn)
+        if not healthy:
+            return self.writer
+
+        if self.balancing == "least_connections":
+            return min(healthy, key=lambda replica: replica.connections).engine
+
+        return healthy[next(self._counter) % len(healthy)].engine
+
+    def is_available(self, engine: AsyncEngine, min_lsn: int | None = None) -> bool:
+        """
+        Returns whether reads may still be sent to the engine.
+
+        :param min_lsn: The WAL location the replica must have replayed.
+        """
+        eligible = self._eligible(min_lsn)
+        if engine is self.writer:
+            return not eligible
+
+        return any(replica.engine is engine for replica in eligible)
+
+    async def check(self) -> None:
+        """
+        Probes every replica once and updates its health.
+        """
+        await asyncio.gather(*(self._probe(replica) for replica in self.replicas))
+
+    async def start(self) -> None:
+        if not self.replicas or self._task is not None:
+            return
+
+        await self.check()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _eligible(self, min_lsn: int | None) -> list[Replica]:
+        return [
+            replica
+            for replica in self.replicas
+            if replica.healthy and (min_lsn is None or replica.lsn >= min_lsn)
+        ]
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check()
+
+    async def _probe(self, replica: Replica) -> None:
+        started = time.perf_counter()
+        try:
+            lag, lsn = await asyncio.wait_for(
+                self._status(replica.engine), timeout=self.check_timeout
+            )
+        except Exception:  # pylint: disable=broad-except
+            replica.healthy = False
+            return
+
+        replica.latency = time.perf_counter() - started
+        replica.lag = float(lag or 0)
+        replica.lsn = parse_lsn(lsn) if lsn else 0
+        replica.healthy = replica.lag <= self.max_lag
+
+    @staticmethod
+    async def _status(engine: AsyncEngine) -> tuple[float, str | None]:
+        async with engine.connect() as connection:
+            result = await connection.execute(REPLICA_STATUS)
+            return tuple(result.one())
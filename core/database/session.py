@@ -1,42 +1,103 @@
 from contextvars import ContextVar, Token
-from typing import Union
+from typing import Any, Union
 
-from sqlalchemy.ext.asyncio import (
-    AsyncSession,
-    async_scoped_session,
-    create_async_engine,
-)
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
 from sqlalchemy.sql.expression import Delete, Insert, Update
 
 from core.config import config
 
-session_context: ContextVar[str] = ContextVar("session_context")
+from .pool import create_engine
+from .replicas import ReplicaSet
+
+
+class SessionSlot:
+    """
+    Holds the session of one request or standalone unit of work, which is only
+    created once something uses it.
+    """
+
+    __slots__ = ("session",)
 
+    def __init__(self):
+        self.session: AsyncSession | None = None
 
-def get_session_context() -> str:
+
+session_context: ContextVar[SessionSlot] = ContextVar("session_context")
+consistency_context: ContextVar[int | None] = ContextVar(
+    "consistency_context", default=None
+)
+
+
+def get_session_context() -> SessionSlot:
     return session_context.get()
 
 
-def set_session_context(session_id: str) -> Token:
-    return session_context.set(session_id)
+def set_session_context() -> Token:
+    return session_context.set(SessionSlot())
 
 
 def reset_session_context(context: Token) -> None:
     session_context.reset(context)
 
 
-engines = {
-    "writer": create_async_engine(config.POSTGRES_URL, pool_recycle=3600),
-    "reader": create_async_engine(config.POSTGRES_URL, pool_recycle=3600),
-}
+def set_consistency_context(min_lsn: int | None) -> Token:
+    return consistency_context.set(min_lsn)
+
+
+def reset_consistency_context(context: Token) -> None:
+    consistency_context.reset(context)
+
+
+engines = {"writer": create_engine(config.POSTGRES_URL)}
+for index, reader_url in enumerate(config.POSTGRES_READER_URLS):
+    engines[f"reader_{index}"] = create_engine(reader_url)
+
+replicas = ReplicaSet(
+    writer=engines["writer"],
+    readers=[engine for name, engine in engines.items() if name != "writer"],
+    balancing=config.POSTGRES_READER_BALANCING,
+    max_lag=config.POSTGRES_REPLICA_MAX_LAG,
+    check_interval=config.POSTGRES_REPLICA_CHECK_INTERVAL,
+    check_timeout=config.POSTGRES_REPLICA_CHECK_TIMEOUT,
+)
 
 
 class RoutingSession(Session):
-    def get_bind(self, mapper=None, clause=None, **kwargs):
-        if self._flushing or isinstance(clause, (Update, Delete, Insert)):
+    def get_bind(self, mapper=None, clause=None, writer=False, **kwargs):
+        if writer:
             return engines["writer"].sync_engine
-        return engines["reader"].sync_engine
+
+        if isinstance(clause, (Update, Delete, Insert)):
+            # Bulk statements bypass the flush, so they pin reads here.
+            self.info["pinned"] = True
+            return engines["writer"].sync_engine
+
+        if self._flushing or self.info.get("pinned"):
+            return engines["writer"].sync_engine
+
+        # Reads stick to one engine per session so they see a single replica.
+        reader = self.info.get("reader")
+        min_lsn = consistency_context.get()
+        if reader is None or not replicas.is_available(reader, min_lsn):
+            reader = self.info["reader"] = replicas.choose(min_lsn)
+
+        return reader.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _pin_to_writer(session_: RoutingSession, flush_context) -> None:
+    # Replicas may not have the flushed rows yet, so the session reads its own
+    # writes from the writer from now on.
+    session_.info["pinned"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _remember_commit(session_: RoutingSession) -> None:
+    # Only sessions that wrote are pinned, read-only commits need no token.
+    if session_.info.get("pinned"):
+        session_.info["committed"] = True
 
 
 async_session_factory = sessionmaker(
@@ -45,10 +106,56 @@ async_session_factory = sessionmaker(
     expire_on_commit=False,
 )
 
-session: Union[AsyncSession, async_scoped_session] = async_scoped_session(
-    session_factory=async_session_factory,
-    scopefunc=get_session_context,
-)
+
+class SessionProxy:
+    """
+    Proxies the session of the current context, creating it on first use.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        # Protocol lookups such as copy or inspect must not create a session.
+        if name.startswith("__"):
+            raise AttributeError(name)
+
+        slot = get_session_context()
+        if slot.session is None:
+            slot.session = async_session_factory()
+
+        return getattr(slot.session, name)
+
+    def has(self) -> bool:
+        """
+        Returns whether the current context has created its session.
+        """
+        slot = session_context.get(None)
+        return slot is not None and slot.session is not None
+
+    async def close(self) -> None:
+        if self.has():
+            await get_session_context().session.close()
+
+    async def remove(self) -> None:
+        """
+        Closes the session of the current context and forgets it.
+        """
+        if self.has():
+            slot = get_session_context()
+            current, slot.session = slot.session, None
+            await current.close()
+
+
+session: Union[AsyncSession, SessionProxy] = SessionProxy()
+
+
+async def get_consistency_token() -> str | None:
+    """
+    Returns the writer's current WAL location if the session of this context
+    committed anything, which replicas must have replayed to see the commit.
+    """
+    if not session.has() or not session.info.get("committed"):
+        return None
+
+    return await session.scalar(text("SELECT pg_current_wal_lsn()::text"))
 
 
 async def get_session():
@@ -1,15 +1,12 @@
-from uuid import uuid4
-
 from .session import reset_session_context, session, set_session_context
 
 
 def standalone_session(func):
     async def _standalone_session(*args, **kwargs):
-        session_id = str(uuid4())
-        context = set_session_context(session_id=session_id)
+        context = set_session_context()
 
         try:
-            await func(*args, **kwargs)
+            return await func(*args, **kwargs)
         except Exception as exception:
             await session.rollback()
             raise exception
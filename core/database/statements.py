@@ -0,0 +1,74 @@
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+class StatementCacheMetrics:
+    """
+    Counts how often executed statements were found in the engine's compiled
+    statement cache.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def observe(self, cache_hit: CacheStats) -> None:
+        if cache_hit == CacheStats.CACHE_HIT:
+            self.hits += 1
+        elif cache_hit == CacheStats.CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else None,
+            "uncached": self.uncached,
+        }
+
+
+statement_cache_metrics: WeakKeyDictionary[
+    Engine, StatementCacheMetrics
+] = WeakKeyDictionary()
+
+
+def instrument_statement_cache(engine: AsyncEngine) -> StatementCacheMetrics:
+    """
+    Starts counting compiled statement cache hits of the engine.
+
+    :param engine: The engine to instrument.
+    :return: The metrics of the engine.
+    """
+    metrics = statement_cache_metrics.get(engine.sync_engine)
+    if metrics is not None:
+        return metrics
+
+    metrics = statement_cache_metrics[engine.sync_engine] = StatementCacheMetrics()
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _observe(connection, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            metrics.observe(context.cache_hit)
+
+    return metrics
+
+
+def statement_cache_stats(engines: dict[str, AsyncEngine]) -> dict[str, dict]:
+    """
+    Returns the compiled statement cache counters of every instrumented engine
+    by name.
+    """
+    return {
+        name: statement_cache_metrics[engine.sync_engine].snapshot()
+        for name, engine in engines.items()
+        if engine.sync_engine in statement_cache_metrics
+    }
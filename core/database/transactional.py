@@ -1,55 +1,179 @@
+import logging
 from enum import Enum
 from functools import wraps
+from typing import Any, Awaitable, Callable, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from core.database import session
+from core.database.session import reset_session_context, set_session_context
+
+logger = logging.getLogger(__name__)
+
+SCOPE = "transactional_scope"
+PENDING_CALLBACKS = "after_commit"
+COMMITTED_CALLBACKS = "committed_callbacks"
+
+
+def after_commit(
+    session_: Any, callback: Callable[[], Awaitable[Any]], key: Hashable = None
+) -> None:
+    """
+    Runs the callback once the session's transaction commits. Transactional
+    awaits the callbacks right after its commit, and they are dropped if the
+    transaction is rolled back instead.
+
+    :param session_: The session whose transaction the callback waits for.
+    :param callback: The coroutine function to call.
+    :param key: Callbacks registered under the same key run only once.
+    """
+    callbacks = session_.info.setdefault(PENDING_CALLBACKS, {})
+    callbacks.setdefault(object() if key is None else key, callback)
+
+
+async def run_after_commit(session_: Any) -> None:
+    """
+    Awaits the callbacks of the session's committed transactions. The
+    transaction is committed whatever they do, so a failing callback is
+    logged rather than raised, and the others still run.
+
+    :param session_: The session.
+    """
+    callbacks = session_.info.pop(COMMITTED_CALLBACKS, {})
+    for callback in callbacks.values():
+        try:
+            await callback()
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("After-commit callback %r failed", callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _commit_callbacks(session_: Session) -> None:
+    callbacks = session_.info.pop(PENDING_CALLBACKS, None)
+    if callbacks:
+        committed = session_.info.setdefault(COMMITTED_CALLBACKS, {})
+        for key, callback in callbacks.items():
+            committed.setdefault(key, callback)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_callbacks(session_: Session, transaction: Any) -> None:
+    # Whatever is still pending when the outermost transaction ends was
+    # rolled back, or closed without a commit.
+    if transaction.parent is None:
+        session_.info.pop(PENDING_CALLBACKS, None)
 
 
 class Propagation(Enum):
     REQUIRED = "required"
     REQUIRED_NEW = "required_new"
+    READ_ONLY = "read_only"
 
 
 class Transactional:
-    def __init__(self, propagation: Propagation = Propagation.REQUIRED):
+    def __init__(
+        self,
+        propagation: Propagation = Propagation.REQUIRED,
+        deferrable: bool = False,
+    ):
+        """
+        :param propagation: How the function joins or opens a transaction.
+        :param deferrable: For READ_ONLY, whether to open a SERIALIZABLE READ
+            ONLY DEFERRABLE transaction, which waits for a snapshot that can
+            never fail serialization. Hot standbys do not support it, so it
+            always runs on the writer.
+        """
         self.propagation = propagation
+        self.deferrable = deferrable
 
     def __call__(self, function):
         @wraps(function)
         async def decorator(*args, **kwargs):
-            try:
-                if self.propagation == Propagation.REQUIRED:
-                    result = await self._run_required(
-                        function=function,
-                        args=args,
-                        kwargs=kwargs,
-                    )
-                elif self.propagation == Propagation.REQUIRED_NEW:
-                    result = await self._run_required_new(
-                        function=function,
-                        args=args,
-                        kwargs=kwargs,
-                    )
-                else:
-                    result = await self._run_required(
-                        function=function,
-                        args=args,
-                        kwargs=kwargs,
-                    )
-            except Exception as exception:
-                await session.rollback()
-                raise exception
-
-            return result
+            if self.propagation == Propagation.REQUIRED_NEW:
+                return await self._run_required_new(
+                    function=function,
+                    args=args,
+                    kwargs=kwargs,
+                )
+            if self.propagation == Propagation.READ_ONLY:
+                return await self._run_read_only(
+                    function=function,
+                    args=args,
+                    kwargs=kwargs,
+                )
+
+            return await self._run_required(
+                function=function,
+                args=args,
+                kwargs=kwargs,
+            )
 
         return decorator
 
     async def _run_required(self, function, args, kwargs) -> None:
-        result = await function(*args, **kwargs)
-        await session.commit()
-        return result
+        # Inside another scope, the function joins its transaction and leaves
+        # the commit or rollback to it.
+        if session.info.get(SCOPE):
+            return await function(*args, **kwargs)
+
+        return await self._run_scope(function, args, kwargs)
 
     async def _run_required_new(self, function, args, kwargs) -> None:
-        session.begin()
-        result = await function(*args, **kwargs)
+        # A session of its own, so its commit or rollback leaves the
+        # caller's transaction alone.
+        context = set_session_context()
+        try:
+            return await self._run_scope(function, args, kwargs)
+        finally:
+            await session.remove()
+            reset_session_context(context)
+
+    async def _run_read_only(self, function, args, kwargs) -> None:
+        # Inside a scope or a transaction, the reads simply join it, so the
+        # scope can still write what they load.
+        if session.info.get(SCOPE) or session.in_transaction():
+            return await function(*args, **kwargs)
+
+        execution_options = {"postgresql_readonly": True}
+        bind_arguments = {}
+        if self.deferrable:
+            execution_options["isolation_level"] = "SERIALIZABLE"
+            execution_options["postgresql_deferrable"] = True
+            bind_arguments["writer"] = True
+
+        try:
+            await session.connection(
+                bind_arguments=bind_arguments, execution_options=execution_options
+            )
+            # Nothing is written, so nothing is flushed.
+            with session.no_autoflush:
+                result = await function(*args, **kwargs)
+        except Exception as exception:
+            await session.rollback()
+            raise exception
+
+        # The transaction ends with the function, so the connection is not
+        # left idle in transaction, nor read-only for later writes. A commit
+        # keeps the loaded instances usable where a rollback would expire them.
         await session.commit()
         return result
+
+    @staticmethod
+    async def _run_scope(function, args, kwargs) -> None:
+        """
+        Runs the function as the scope that owns the session's transaction,
+        committing it if the function succeeds and rolling it back if not.
+        """
+        session.info[SCOPE] = True
+        try:
+            result = await function(*args, **kwargs)
+            await session.commit()
+        except Exception as exception:
+            await session.rollback()
+            raise exception
+        finally:
+            session.info.pop(SCOPE, None)
+
+        await run_after_commit(session)
+        return result
@@ -1,10 +1,14 @@
 from .authentication import AuthBackend, AuthenticationMiddleware
+from .response_cache import ResponseCacheMiddleware, ResponseCacheRule
 from .response_logger import ResponseLoggerMiddleware
-from .sqlalchemy import SQLAlchemyMiddleware
+from .sqlalchemy import CONSISTENCY_TOKEN_HEADER, SQLAlchemyMiddleware
 
 __all__ = [
     "SQLAlchemyMiddleware",
     "ResponseLoggerMiddleware",
+    "ResponseCacheMiddleware",
+    "ResponseCacheRule",
     "AuthenticationMiddleware",
     "AuthBackend",
+    "CONSISTENCY_TOKEN_HEADER",
 ]
@@ -0,0 +1,179 @@
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from typing import Any, Match, Pattern
+
+from starlette.convertors import Convertor
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import compile_path
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.cache import Cache, CacheTag
+
+
+@dataclass
+class ResponseCacheRule:
+    """
+    Caches the GET responses of a path.
+
+    :param path: The path template, e.g. "/v1/tasks/{task_uuid:uuid}". Give
+        parameters a convertor so the rule only matches the values the route
+        serves, and so the tag gets the same spelling of a value whatever
+        the request used.
+    :param tag: The tag to invalidate the responses with. Its parameters are
+        filled from the converted path parameters.
+    :param ttl: Seconds the responses are cached for.
+    :param principal_parameter: The tag parameter to fill with the id of the
+        authenticated user, if any.
+    """
+
+    path: str
+    tag: CacheTag
+    ttl: int = 60
+    principal_parameter: str | None = None
+    pattern: Pattern = field(init=False, repr=False)
+    convertors: dict[str, Convertor] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.pattern, _, self.convertors = compile_path(self.path)
+
+    def params(self, match: Match) -> dict[str, str]:
+        """
+        Returns the path parameters of a matching path in canonical form.
+
+        :param match: The match of the rule's pattern.
+        :return: The path parameters.
+        """
+        return {
+            name: str(self.convertors[name].convert(value))
+            for name, value in match.groupdict().items()
+        }
+
+
+def make_etag(body: bytes) -> str:
+    return f'"{blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+class ResponseCacheMiddleware:
+    """
+    Stores the rendered body of successful GET responses under a key scoped to
+    the authenticated user, tags them with an ETag and answers matching
+    If-None-Match requests with 304 without calling the route. The responses
+    are removed with Cache.remove_by_tag like any other cached value.
+    """
+
+    def __init__(self, app: ASGIApp, rules: list[ResponseCacheRule]) -> None:
+        self.app = app
+        self.rules = rules
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return await self.app(scope, receive, send)
+
+        for rule in self.rules:
+            if match := rule.pattern.match(scope["path"]):
+                break
+        else:
+            return await self.app(scope, receive, send)
+
+        principal = getattr(scope.get("user"), "id", None)
+        params = rule.params(match)
+        if rule.principal_parameter is not None:
+            if principal is None:
+                return await self.app(scope, receive, send)
+
+            params[rule.principal_parameter] = principal
+
+        key = self._make_key(rule.tag.format(**params), principal, scope)
+        if_none_match = Headers(scope=scope).get("if-none-match")
+
+        cached_response = await Cache.get(key)
+        if cached_response is not None:
+            status, headers, body = cached_response
+            return await self._respond(send, status, headers, body, if_none_match)
+
+        start: Message = {}
+        chunks: list[bytes] = []
+
+        async def _caching_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                start.update(message)
+                # Streamed responses have no length, they are passed through
+                # rather than buffered.
+                if "content-length" in Headers(raw=start.get("headers", [])):
+                    return
+                start.clear()
+
+            if not start or message["type"] != "http.response.body":
+                return await send(message)
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = list(start.get("headers", []))
+            if start["status"] != 200 or not self._is_cacheable(headers):
+                await send(start)
+                return await send({"type": "http.response.body", "body": body})
+
+            mutable_headers = MutableHeaders(raw=headers)
+            mutable_headers["etag"] = make_etag(body)
+            mutable_headers.add_vary_header("Authorization")
+
+            await Cache.set(response=(200, headers, body), key=key, ttl=rule.ttl)
+            await self._respond(send, 200, headers, body, if_none_match)
+
+        await self.app(scope, receive, _caching_send)
+
+    @staticmethod
+    def _make_key(prefix: str, principal: Any, scope: Scope) -> str:
+        digest = blake2b(digest_size=16)
+        for part in (str(principal), scope["path"], scope["query_string"].decode()):
+            digest.update(part.encode())
+            digest.update(b"\0")
+
+        return f"{prefix}::response:{digest.hexdigest()}"
+
+    @staticmethod
+    def _is_cacheable(headers: list[tuple[bytes, bytes]]) -> bool:
+        response_headers = Headers(raw=headers)
+        cache_control = response_headers.get("cache-control", "")
+        return "set-cookie" not in response_headers and "no-store" not in cache_control
+
+    @staticmethod
+    async def _respond(
+        send: Send,
+        status: int,
+        headers: list[tuple[bytes, bytes]],
+        body: bytes,
+        if_none_match: str | None,
+    ) -> None:
+        response_headers = Headers(raw=headers)
+        if etag_matches(if_none_match, response_headers["etag"]):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": [
+                        (name, value)
+                        for name, value in headers
+                        if name in (b"etag", b"vary", b"cache-control")
+                    ],
+                }
+            )
+            return await send({"type": "http.response.body", "body": b""})
+
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
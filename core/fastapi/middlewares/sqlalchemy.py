@@ -1,8 +1,19 @@
-from uuid import uuid4
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from starlette.types import ASGIApp, Receive, Scope, Send
+from core.database.replicas import parse_lsn
+from core.database.session import (
+    get_consistency_token,
+    reset_consistency_context,
+    reset_session_context,
+    session,
+    set_consistency_context,
+    set_session_context,
+)
 
-from core.database.session import reset_session_context, session, set_session_context
+CONSISTENCY_TOKEN_HEADER = "X-Consistency-Token"
+CONSISTENCY_TOKEN_NAME = CONSISTENCY_TOKEN_HEADER.lower().encode("latin-1")
 
 
 class SQLAlchemyMiddleware:
@@ -10,13 +21,40 @@ class SQLAlchemyMiddleware:
         self.app = app
 
     async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
-        session_id = str(uuid4())
-        context = set_session_context(session_id=session_id)
+        context = set_session_context()
+        consistency = set_consistency_context(min_lsn=self._min_lsn(scope))
+
+        async def _consistent_send(message: Message) -> None:
+            if message["type"] == "http.response.start" and session.has():
+                try:
+                    token = await get_consistency_token()
+                except SQLAlchemyError:
+                    token = None
+
+                if token is not None:
+                    MutableHeaders(scope=message)[CONSISTENCY_TOKEN_HEADER] = token
+
+            await send(message)
 
         try:
-            await self.app(scope, receive, send)
+            await self.app(scope, receive, _consistent_send)
         except Exception as exception:
             raise exception
         finally:
             await session.remove()
+            reset_consistency_context(context=consistency)
             reset_session_context(context=context)
+
+    @staticmethod
+    def _min_lsn(scope: Scope) -> int | None:
+        if scope["type"] != "http":
+            return None
+
+        for name, value in scope["headers"]:
+            if name == CONSISTENCY_TOKEN_NAME:
+                try:
+                    return parse_lsn(value.decode("latin-1"))
+                except ValueError:
+                    return None
+
+        return None
@@ -0,0 +1,67 @@
+from typing import Any, AsyncIterable, AsyncIterator, Type
+
+from pydantic import BaseModel
+from starlette.requests import Request
+from starlette.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """
+    Returns whether the client asked for newline delimited JSON.
+
+    :param request: The request.
+    :return: True if the Accept header lists NDJSON.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+class StreamingJSONResponse(StreamingResponse):
+    """
+    Serializes rows through a response schema as they arrive, either as
+    newline delimited JSON or as a single JSON array sent in chunks. Rows are
+    buffered up to chunk_size bytes so each chunk carries many of them, and
+    nothing else is kept, so memory does not grow with the number of rows.
+    """
+
+    def __init__(
+        self,
+        rows: AsyncIterable[Any],
+        schema: Type[BaseModel],
+        ndjson: bool = False,
+        chunk_size: int = 64 * 1024,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            self._render(rows, schema, ndjson, chunk_size),
+            media_type=NDJSON_MEDIA_TYPE if ndjson else "application/json",
+            **kwargs,
+        )
+
+    @staticmethod
+    async def _render(
+        rows: AsyncIterable[Any],
+        schema: Type[BaseModel],
+        ndjson: bool,
+        chunk_size: int,
+    ) -> AsyncIterator[bytes]:
+        buffer = bytearray() if ndjson else bytearray(b"[")
+        separator = b""
+
+        async for row in rows:
+            document = schema.from_orm(row).json(by_alias=True).encode()
+            if ndjson:
+                buffer += document + b"\n"
+            else:
+                buffer += separator + document
+                separator = b","
+
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if not ndjson:
+            buffer += b"]"
+        if buffer:
+            yield bytes(buffer)
@@ -1,3 +1,4 @@
 from .base import BaseRepository
+from .count import Count
 
-__all__ = ["BaseRepository"]
+__all__ = ["BaseRepository", "Count"]
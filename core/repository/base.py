@@ -1,18 +1,50 @@
 from functools import reduce
-from typing import Any, Generic, Type, TypeVar
-
-from sqlalchemy import Select, func
+from typing import Any, AsyncIterator, Generic, Type, TypeVar
+
+from sqlalchemy import (
+    Row,
+    Select,
+    cast,
+    delete,
+    func,
+    insert,
+    lambda_stmt,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import immediateload, joinedload, load_only, selectinload
+from sqlalchemy.sql.elements import ClauseElement
 from sqlalchemy.sql.expression import select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
+from core.cache import Cache, CacheTag
 from core.database import Base
 
+from .count import ESTIMATED_COUNT, Count
+from .cursor import decode_cursor, encode_cursor, from_json
+from .loader import Loader
+
 ModelType = TypeVar("ModelType", bound=Base)
 
+LOADING_STRATEGIES = {
+    "selectin": selectinload,
+    "joined": joinedload,
+    "immediate": immediateload,
+}
+
 
 class BaseRepository(Generic[ModelType]):
     """Base class for data repositories."""
 
+    # Unfiltered counts of tables estimated to hold more rows are not exact.
+    count_estimate_threshold: int = 100_000
+    # Whether ids and uuids of the model may be cached as missing, which
+    # every insert then has to forget. Controllers with a negative_cache_ttl
+    # turn it on, repositories whose model is also inserted elsewhere declare it.
+    negative_cache: bool = False
+
     def __init__(self, model: Type[ModelType], db_session: AsyncSession):
         self.session = db_session
         self.model_class: Type[ModelType] = model
@@ -28,33 +60,285 @@ class BaseRepository(Generic[ModelType]):
             attributes = {}
         model = self.model_class(**attributes)
         self.session.add(model)
+        self._forget_missing()
         return model
 
-    async def get_all(
-        self, skip: int = 0, limit: int = 100, join_: set[str] | None = None
+    async def create_many(
+        self, rows: list[dict[str, Any]], batch_size: int = 1000
     ) -> list[ModelType]:
+        """
+        Inserts the rows with one multi-row INSERT ... RETURNING per batch.
+
+        :param rows: The attributes of each model instance.
+        :param batch_size: The number of rows per statement.
+        :return: The created model instances, in the order of the rows.
+        """
+        query = insert(self.model_class).returning(
+            self.model_class, sort_by_parameter_order=True
+        )
+        models = await self._execute_many(query, rows, batch_size)
+        self._forget_missing()
+        return models
+
+    async def upsert_many(
+        self,
+        rows: list[dict[str, Any]],
+        index_elements: list[str],
+        update_fields: list[str] | None = None,
+        batch_size: int = 1000,
+    ) -> list[ModelType]:
+        """
+        Inserts the rows, updating the existing ones that conflict on the
+        index elements, with one INSERT ... ON CONFLICT DO UPDATE per batch.
+
+        :param rows: The attributes of each model instance.
+        :param index_elements: The columns of the unique index to match on.
+        :param update_fields: The columns to update on conflict, by default
+            every given column outside the index elements.
+        :param batch_size: The number of rows per statement.
+        :return: The created or updated model instances.
+        """
+        if not rows:
+            return []
+
+        if update_fields is None:
+            update_fields = [name for name in rows[0] if name not in index_elements]
+
+        query = pg_insert(self.model_class)
+        set_ = {name: query.excluded[name] for name in update_fields}
+        for column in self.model_class.__table__.columns:
+            onupdate = column.onupdate
+            if onupdate is not None and column.name not in set_:
+                if isinstance(onupdate.arg, ClauseElement):
+                    set_[column.name] = onupdate.arg
+
+        query = (
+            query.on_conflict_do_update(index_elements=index_elements, set_=set_)
+            .returning(self.model_class, sort_by_parameter_order=True)
+            .execution_options(populate_existing=True)
+        )
+        models = await self._execute_many(query, rows, batch_size)
+        self._forget_missing()
+        return models
+
+    async def copy_many(self, rows: list[dict[str, Any]]) -> int:
+        """
+        Loads the rows with PostgreSQL's COPY, the fastest path for very large
+        imports. Column defaults are filled in here, SQL defaults evaluated
+        once for all rows, and no model instances are returned.
+
+        :param rows: The attributes of each row.
+        :return: The number of rows copied.
+        """
+        if not rows:
+            return 0
+
+        table = self.model_class.__table__
+        names = list(rows[0])
+        defaults = {}
+        for column in table.columns:
+            default = column.default
+            if column.name in names or default is None or default.is_sequence:
+                continue
+
+            names.append(column.name)
+            if default.is_clause_element:
+                value = await self.session.scalar(
+                    select(cast(default.arg, column.type))
+                )
+                defaults[column.name] = lambda value=value: value
+            elif default.is_callable:
+                defaults[column.name] = lambda arg=default.arg: arg(None)
+            else:
+                defaults[column.name] = lambda value=default.arg: value
+
+        records = [
+            tuple(row[name] if name in row else defaults[name]() for name in names)
+            for row in rows
+        ]
+
+        # Routed like an INSERT, so it runs on the writer.
+        connection = await self.session.connection(
+            bind_arguments={"clause": insert(self.model_class)}
+        )
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=names
+        )
+        self._forget_missing()
+        return len(records)
+
+    async def get_all(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        join_: set[str] | dict[str, str] | None = None,
+        fields: set[str] | None = None,
+        rows: bool = False,
+    ) -> list[ModelType] | list[Row]:
         """
         Returns a list of model instances.
 
         :param skip: The number of records to skip.
         :param limit: The number of record to return.
         :param join_: The joins to make.
-        :return: A list of model instances.
+        :param fields: The only columns to load, all of them by default.
+        :param rows: Whether to return plain rows instead of model instances.
+        :return: A list of model instances, or rows.
         """
-        query = self._query(join_)
-        query = query.offset(skip).limit(limit)
+        query = self._query(join_, fields=fields, rows=rows)
+        query += lambda s: s.offset(skip).limit(limit)
 
+        if rows:
+            return await self._rows(query)
         if join_ is not None:
-            return await self.all_unique(query)
-            
+            return await self._all_unique(query)
+
         return await self._all(query)
 
+    async def get_page(
+        self,
+        after: str | None = None,
+        limit: int = 100,
+        order_by: tuple[str, ...] = ("id",),
+        join_: set[str] | dict[str, str] | None = None,
+        fields: set[str] | None = None,
+        rows: bool = False,
+    ) -> tuple[list[ModelType] | list[Row], str | None]:
+        """
+        Returns a page of model instances following the cursor. Rows are
+        found by comparing the ordering columns with the last row of the
+        previous page rather than by an offset, so with an index on the
+        ordering columns every page costs the same.
+
+        :param after: The cursor of the previous page, None for the first page.
+        :param limit: The number of records to return.
+        :param order_by: The ascending ordering columns. The id is appended
+            if missing so the ordering is unique.
+        :param join_: The joins to make.
+        :param fields: The only columns to load, the ordering columns are
+            always loaded.
+        :param rows: Whether to return plain rows instead of model instances.
+        :return: The model instances and the cursor of the next page, or None
+            if this is the last page.
+        :raises ValueError: If the cursor is malformed or for another ordering.
+        """
+        if "id" not in order_by:
+            order_by = (*order_by, "id")
+
+        columns = tuple(getattr(self.model_class, name) for name in order_by)
+        if fields is not None:
+            fields = {*fields, *order_by}
+        query = self._query(join_, fields=fields, rows=rows)
+
+        if after is not None:
+            values = decode_cursor(after, order_by)
+            condition = tuple_(*columns) > tuple_(
+                *(
+                    from_json(value, column.type.python_type)
+                    for column, value in zip(columns, values)
+                )
+            )
+            query = query.add_criteria(
+                lambda s: s.where(condition), track_on=[condition]
+            )
+
+        ordering = tuple(column.asc() for column in columns)
+        query = query.add_criteria(lambda s: s.order_by(*ordering), track_on=[ordering])
+        # One extra row tells whether there is a next page.
+        size = limit + 1
+        query += lambda s: s.limit(size)
+
+        if rows:
+            models = await self._rows(query)
+        elif join_ is not None:
+            models = await self._all_unique(query)
+        else:
+            models = await self._all(query)
+
+        if len(models) <= limit:
+            return models, None
+
+        models = models[:limit]
+        last = models[-1]
+        return models, encode_cursor(
+            order_by, tuple(getattr(last, name) for name in order_by)
+        )
+
+    async def stream(
+        self,
+        filters: dict[str, Any] | None = None,
+        order_by: tuple[str, ...] = ("id",),
+        yield_per: int = 1000,
+        fields: set[str] | None = None,
+        rows: bool = False,
+    ) -> AsyncIterator[ModelType] | AsyncIterator[Row]:
+        """
+        Yields the model instances matching the filters as they are read from
+        a server-side cursor, so only yield_per rows are held in memory at a
+        time. Joins are not supported, collections cannot be eager loaded in
+        batches.
+
+        :param filters: The fields to match, a list, tuple or set matches any
+            of its values.
+        :param order_by: The ascending ordering columns.
+        :param yield_per: The number of rows fetched per round trip.
+        :param fields: The only columns to load, all of them by default.
+        :param rows: Whether to yield plain rows instead of model instances.
+        :return: An async iterator of model instances, or rows.
+        """
+        query = self._query(fields=fields, rows=rows)
+
+        conditions = tuple(self._where(filters or {}))
+        if conditions:
+            query = query.add_criteria(
+                lambda s: s.where(*conditions), track_on=[conditions]
+            )
+
+        ordering = tuple(getattr(self.model_class, name).asc() for name in order_by)
+        query = query.add_criteria(lambda s: s.order_by(*ordering), track_on=[ordering])
+
+        execution_options = {"yield_per": yield_per}
+        if rows:
+            result = await self.session.stream(
+                query, execution_options=execution_options
+            )
+        else:
+            result = await self.session.stream_scalars(
+                query, execution_options=execution_options
+            )
+
+        async for model in result:
+            yield model
+
+    async def count(self, filters: dict[str, Any] | None = None) -> Count:
+        """
+        Returns the number of records matching the filters. Without filters,
+        tables the planner estimates above count_estimate_threshold rows are
+        not scanned and the estimate is returned instead.
+
+        :param filters: The fields to match, a list, tuple or set matches any
+            of its values.
+        :return: The number of records and whether it is exact.
+        """
+        if not filters:
+            estimate = await self.session.scalar(
+                ESTIMATED_COUNT, {"table": self.model_class.__tablename__}
+            )
+            if estimate >= self.count_estimate_threshold:
+                return Count(total=estimate, exact=False)
+
+        query = select(self.model_class).where(*self._where(filters or {}))
+        return Count(total=await self._count(query), exact=True)
+
     async def get_by(
         self,
         field: str,
         value: Any,
-        join_: set[str] | None = None,
+        join_: set[str] | dict[str, str] | None = None,
         unique: bool = False,
+        fields: set[str] | None = None,
+        rows: bool = False,
     ) -> ModelType:
         """
         Returns the model instance matching the field and value.
@@ -62,18 +346,49 @@ class BaseRepository(Generic[ModelType]):
         :param field: The field to match.
         :param value: The value to match.
         :param join_: The joins to make.
+        :param unique: Whether to return the single matching instance, or None.
+        :param fields: The only columns to load, all of them by default.
+        :param rows: Whether to return plain rows instead of model instances.
         :return: The model instance.
         """
-        query = self._query(join_)
+        query = self._query(join_, fields=fields, rows=rows)
         query = await self._get_by(query, field, value)
 
+        if rows:
+            result = await self.session.execute(query)
+            return result.one_or_none() if unique else result.all()
+        if join_ is not None and unique:
+            return await self._one_or_none_unique(query)
         if join_ is not None:
-            return await self.all_unique(query)
+            return await self._all_unique(query)
         if unique:
-            return await self._one(query)
+            return await self._one_or_none(query)
 
         return await self._all(query)
 
+    async def load(self, field: str, value: Any) -> ModelType | None:
+        """
+        Returns the model instance matching the field and value, looked up at
+        most once per session. Lookups made concurrently are batched into one
+        query.
+
+        :param field: The field to match, usually id or uuid.
+        :param value: The value to match.
+        :return: The model instance, or None.
+        """
+        return await Loader.of(self, field).load(value)
+
+    def loaded(self, field: str, value: Any) -> ModelType | None:
+        """
+        Returns the model instance this session already loaded with load, or
+        None, without querying.
+
+        :param field: The field to match, usually id or uuid.
+        :param value: The value to match.
+        :return: The model instance, or None.
+        """
+        return Loader.of(self, field).peek(value)
+
     async def delete(self, model: ModelType) -> None:
         """
         Deletes the model.
@@ -81,27 +396,178 @@ class BaseRepository(Generic[ModelType]):
         :param model: The model to delete.
         :return: None
         """
-        self.session.delete(model)
+        await self.session.delete(model)
+        Loader.forget(self.session, self.model_class)
+
+    async def update_where(
+        self,
+        filters: dict[str, Any],
+        values: dict[str, Any],
+        returning: bool = False,
+        all_rows: bool = False,
+    ) -> list[ModelType] | int:
+        """
+        Updates every row matching the filters with a single UPDATE ... WHERE,
+        without loading the rows. Instances already in the session are
+        synchronized with the new values.
+
+        :param filters: The fields to match, a list, tuple or set matches any
+            of its values.
+        :param values: The values to set.
+        :param returning: Whether to return the updated model instances.
+        :param all_rows: Whether empty filters may update the whole table.
+        :return: The updated model instances, or the number of updated rows.
+        :raises ValueError: If the filters are empty and all_rows is not set.
+        """
+        query = (
+            update(self.model_class)
+            .where(*self._required_where(filters, all_rows))
+            .values(values)
+            .execution_options(synchronize_session="auto")
+        )
+        return await self._execute_where(query, returning)
+
+    async def delete_where(
+        self,
+        filters: dict[str, Any],
+        returning: bool = False,
+        all_rows: bool = False,
+    ) -> list[ModelType] | int:
+        """
+        Deletes every row matching the filters with a single DELETE ... WHERE,
+        without loading the rows. Instances already in the session are
+        marked as deleted.
+
+        :param filters: The fields to match, a list, tuple or set matches any
+            of its values.
+        :param returning: Whether to return the deleted model instances.
+        :param all_rows: Whether empty filters may delete the whole table.
+        :return: The deleted model instances, or the number of deleted rows.
+        :raises ValueError: If the filters are empty and all_rows is not set.
+        """
+        query = (
+            delete(self.model_class)
+            .where(*self._required_where(filters, all_rows))
+            .execution_options(synchronize_session="auto")
+        )
+        Loader.forget(self.session, self.model_class)
+        return await self._execute_where(query, returning)
+
+    def _forget_missing(self) -> None:
+        """
+        Forgets every id and uuid of the model that was cached as missing,
+        once the inserting transaction commits.
+        """
+        if self.negative_cache:
+            Cache.remove_by_tag_on_commit(
+                self.session, CacheTag.NOT_FOUND, table=self.model_class.__tablename__
+            )
 
     def _query(
         self,
-        join_: set[str] | None = None,
+        join_: set[str] | dict[str, str] | None = None,
         order_: dict | None = None,
-    ) -> Select:
+        fields: set[str] | None = None,
+        rows: bool = False,
+    ) -> StatementLambdaElement:
         """
-        Returns a callable that can be used to query the model.
+        Returns a lambda statement that can be used to query the model. Its
+        compiled form is cached by model, joins, order and filtered fields, so
+        repeated queries only bind new values.
 
         :param join_: The joins to make.
         :param order_: The order of the results. (e.g desc, asc)
-        :return: A callable that can be used to query the model.
+        :param fields: The only columns to load. Other columns of the model
+            instances raise when accessed instead of being loaded.
+        :param rows: Whether to select the columns as plain rows, which skips
+            the identity map and instrumentation of model instances.
+        :return: A lambda statement that can be used to query the model.
         """
-        query = select(self.model_class)
+        model = self.model_class
+        if rows:
+            if join_:
+                raise TypeError("join_ cannot be used with rows")
+
+            columns = self._columns(fields)
+            query = lambda_stmt(lambda: select(*columns), track_on=[columns])
+        else:
+            query = lambda_stmt(lambda: select(model))
+            query = self._maybe_load_only(query, fields)
+
         query = self._maybe_join(query, join_)
         query = self._maybe_ordered(query, order_)
 
         return query
 
-    async def _all(self, query: Select) -> list[ModelType]:
+    async def _execute_many(
+        self, query: Any, rows: list[dict[str, Any]], batch_size: int
+    ) -> list[ModelType]:
+        """
+        Executes the statement for the rows in batches.
+
+        :param query: The INSERT statement returning the model.
+        :param rows: The parameters of each row.
+        :param batch_size: The number of rows per statement.
+        :return: The returned model instances.
+        """
+        models = []
+        for start in range(0, len(rows), batch_size):
+            result = await self.session.scalars(query, rows[start : start + batch_size])
+            models.extend(result.all())
+
+        return models
+
+    def _where(self, filters: dict[str, Any]) -> list[ClauseElement]:
+        """
+        Returns the conditions matching the filters.
+
+        :param filters: The fields to match.
+        :return: The conditions.
+        """
+        conditions = []
+        for field, value in filters.items():
+            column = getattr(self.model_class, field)
+            if isinstance(value, (list, tuple, set)):
+                conditions.append(column.in_(value))
+            else:
+                conditions.append(column == value)
+
+        return conditions
+
+    def _required_where(
+        self, filters: dict[str, Any], all_rows: bool
+    ) -> list[ClauseElement]:
+        """
+        Returns the conditions matching the filters of a bulk UPDATE or
+        DELETE, which must not silently apply to the whole table.
+
+        :param filters: The fields to match.
+        :param all_rows: Whether empty filters may match every row.
+        :return: The conditions.
+        """
+        if not filters and not all_rows:
+            raise ValueError("No filters given, pass all_rows=True to match every row")
+
+        return self._where(filters)
+
+    async def _execute_where(
+        self, query: ClauseElement, returning: bool
+    ) -> list[ModelType] | int:
+        """
+        Executes a filtered UPDATE or DELETE.
+
+        :param query: The query to execute.
+        :param returning: Whether to return the affected model instances.
+        :return: The affected model instances, or the number of affected rows.
+        """
+        if returning:
+            result = await self.session.execute(query.returning(self.model_class))
+            return result.scalars().all()
+
+        result = await self.session.execute(query)
+        return result.rowcount
+
+    async def _all(self, query: StatementLambdaElement) -> list[ModelType]:
         """
         Returns all results from the query.
 
@@ -111,11 +577,40 @@ class BaseRepository(Generic[ModelType]):
         query = await self.session.scalars(query)
         return query.all()
 
-    async def _all_unique(self, query: Select) -> list[ModelType]:
+    async def _all_unique(self, query: StatementLambdaElement) -> list[ModelType]:
+        """
+        Returns all distinct results from the query, for queries that may
+        return an instance once per row of a joined collection.
+
+        :param query: The query to execute.
+        :return: A list of model instances.
+        """
         result = await self.session.execute(query)
         return result.unique().scalars().all()
 
-    async def _first(self, query: Select) -> ModelType | None:
+    async def _one_or_none_unique(
+        self, query: StatementLambdaElement
+    ) -> ModelType | None:
+        """
+        Returns the single distinct result from the query or None.
+
+        :param query: The query to execute.
+        :return: The model instance.
+        """
+        result = await self.session.execute(query)
+        return result.unique().scalars().one_or_none()
+
+    async def _rows(self, query: StatementLambdaElement) -> list[Row]:
+        """
+        Returns all results from the query as rows.
+
+        :param query: The query to execute.
+        :return: A list of rows.
+        """
+        result = await self.session.execute(query)
+        return result.all()
+
+    async def _first(self, query: StatementLambdaElement) -> ModelType | None:
         """
         Returns the first result from the query.
 
@@ -125,12 +620,12 @@ class BaseRepository(Generic[ModelType]):
         query = await self.session.scalars(query)
         return query.first()
 
-    async def _one_or_none(self, query: Select) -> ModelType | None:
+    async def _one_or_none(self, query: StatementLambdaElement) -> ModelType | None:
         """Returns the first result from the query or None."""
         query = await self.session.scalars(query)
         return query.one_or_none()
 
-    async def _one(self, query: Select) -> ModelType:
+    async def _one(self, query: StatementLambdaElement) -> ModelType:
         """
         Returns the first result from the query or raises NoResultFound.
 
@@ -152,12 +647,12 @@ class BaseRepository(Generic[ModelType]):
 
     async def _sort_by(
         self,
-        query: Select,
+        query: StatementLambdaElement,
         sort_by: str,
         order: str | None = "asc",
         model: Type[ModelType] | None = None,
         case_insensitive: bool = False,
-    ) -> Select:
+    ) -> StatementLambdaElement:
         """
         Returns the query sorted by the given column.
 
@@ -178,38 +673,106 @@ class BaseRepository(Generic[ModelType]):
             order_column = getattr(model, sort_by)
 
         if order == "desc":
-            return query.order_by(order_column.desc())
+            ordering = order_column.desc()
+        else:
+            ordering = order_column.asc()
 
-        return query.order_by(order_column.asc())
+        return query.add_criteria(lambda s: s.order_by(ordering), track_on=[ordering])
 
-    async def _get_by(self, query: Select, field: str, value: Any) -> Select:
+    async def _get_by(
+        self, query: StatementLambdaElement, field: str, value: Any
+    ) -> StatementLambdaElement:
         """
-        Returns the query filtered by the given column.
+        Returns the query filtered by the given column. The value is bound as
+        a parameter, so the compiled query is shared by every value.
 
         :param query: The query to filter.
         :param field: The column to filter by.
-        :param value: The value to filter by.
+        :param value: The value to filter by, a list, tuple or set matches any
+            of its values.
         :return: The filtered query.
         """
-        return query.where(getattr(self.model_class, field) == value)
+        column = getattr(self.model_class, field)
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            query += lambda s: s.where(column.in_(values))
+        else:
+            query += lambda s: s.where(column == value)
+
+        return query
+
+    def _columns(self, fields: set[str] | None = None) -> tuple[Any, ...]:
+        """
+        Returns the columns of the model with the given names, in a stable
+        order, or every column.
+
+        :param fields: The names of the columns.
+        :return: The columns.
+        """
+        if fields is None:
+            fields = self.model_class.__mapper__.column_attrs.keys()
+
+        return tuple(getattr(self.model_class, name) for name in sorted(fields))
+
+    def _maybe_load_only(
+        self, query: StatementLambdaElement, fields: set[str] | None = None
+    ) -> StatementLambdaElement:
+        """
+        Returns the query loading only the given columns.
+
+        :param query: The query to restrict.
+        :param fields: The columns to load.
+        :return: The query loading only the given columns.
+        """
+        if not fields:
+            return query
+
+        columns = self._columns(fields)
+        return query.add_criteria(
+            lambda s: s.options(load_only(*columns, raiseload=True)),
+            track_on=[columns],
+        )
 
-    def _maybe_join(self, query: Select, join_: set[str] | None = None) -> Select:
+    def _maybe_join(
+        self,
+        query: StatementLambdaElement,
+        join_: set[str] | dict[str, str] | None = None,
+    ) -> StatementLambdaElement:
         """
         Returns the query with the given joins.
 
         :param query: The query to join.
-        :param join_: The joins to make.
+        :param join_: The relationships to load, either a set of names or a
+            mapping of names to a loading strategy of LOADING_STRATEGIES.
         :return: The query with the given joins.
         """
         if not join_:
             return query
 
-        if not isinstance(join_, set):
-            raise TypeError("join_ must be a set")
-
-        return reduce(self._add_join_to_query, join_, query)
-
-    def _maybe_ordered(self, query: Select, order_: dict | None = None) -> Select:
+        if isinstance(join_, set):
+            join_ = dict.fromkeys(join_)
+        elif not isinstance(join_, dict):
+            raise TypeError("join_ must be a set or a dict")
+
+        for strategy in join_.values():
+            if strategy is not None and strategy not in LOADING_STRATEGIES:
+                raise TypeError(f"Unknown loading strategy: {strategy}")
+
+        joins = tuple(sorted(join_.items(), key=lambda item: item[0]))
+
+        # The join methods are opaque to the lambda, so they are keyed by the
+        # repository class and the names and strategies of the joins instead.
+        return query.add_criteria(
+            lambda s: reduce(self._add_join_to_query, joins, s),
+            track_on=[
+                type(self),
+                ",".join(f"{name}:{strategy}" for name, strategy in joins),
+            ],
+        )
+
+    def _maybe_ordered(
+        self, query: StatementLambdaElement, order_: dict | None = None
+    ) -> StatementLambdaElement:
         """
         Returns the query ordered by the given column.
 
@@ -218,21 +781,37 @@ class BaseRepository(Generic[ModelType]):
         :return: The query ordered by the given column.
         """
         if order_:
-            if order_["asc"]:
-                for order in order_["asc"]:
-                    query = query.order_by(getattr(self.model_class, order).asc())
-            else:
-                for order in order_["desc"]:
-                    query = query.order_by(getattr(self.model_class, order).desc())
+            direction = "asc" if order_["asc"] else "desc"
+            ordering = tuple(
+                getattr(getattr(self.model_class, order), direction)()
+                for order in order_[direction]
+            )
+            query = query.add_criteria(
+                lambda s: s.order_by(*ordering), track_on=[ordering]
+            )
 
         return query
 
-    def _add_join_to_query(self, query: Select, join_: set[str]) -> Select:
+    def _add_join_to_query(
+        self, query: Select, join_: tuple[str, str | None]
+    ) -> Select:
         """
-        Returns the query with the given join.
+        Returns the query with the given join. Without a strategy, a
+        _join_<name> method of the repository is used if there is one,
+        otherwise collections are loaded with selectinload, in batches of
+        parent keys, and single objects with joinedload.
 
         :param query: The query to join.
-        :param join_: The join to make.
+        :param join_: The relationship name and its loading strategy, or None.
         :return: The query with the given join.
         """
-        return getattr(self, "_join_" + join_)(query)
+        name, strategy = join_
+        if strategy is None:
+            if hasattr(self, "_join_" + name):
+                return getattr(self, "_join_" + name)(query)
+
+            relationship = self.model_class.__mapper__.relationships[name]
+            strategy = "selectin" if relationship.uselist else "joined"
+
+        loader = LOADING_STRATEGIES[strategy]
+        return query.options(loader(getattr(self.model_class, name)))
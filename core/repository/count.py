@@ -0,0 +1,26 @@
+from typing import NamedTuple
+
+from sqlalchemy import text
+
+# The planner's row estimate from the last ANALYZE, scaled to the current
+# number of pages like the planner does, or -1 if the table was never analyzed.
+ESTIMATED_COUNT = text(
+    """
+    SELECT CASE
+        WHEN c.reltuples < 0 OR c.relpages = 0 THEN -1
+        ELSE (
+            c.reltuples / c.relpages
+            * (pg_relation_size(c.oid) / current_setting('block_size')::int)
+        )::bigint
+    END
+    FROM pg_class c
+    WHERE c.oid = to_regclass(:table)
+    """
+)
+
+
+class Count(NamedTuple):
+    """A number of records and whether it was counted or estimated."""
+
+    total: int
+    exact: bool
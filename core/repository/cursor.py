@@ -0,0 +1,72 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any
+from uuid import UUID
+
+PARSERS = {datetime: datetime.fromisoformat, date: date.fromisoformat, UUID: UUID}
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+
+    return value
+
+
+def encode_cursor(order_by: tuple[str, ...], values: tuple[Any, ...]) -> str:
+    """
+    Encodes the ordering and the ordering values of the last row of a page
+    into an opaque cursor.
+
+    :param order_by: The names of the ordering columns.
+    :param values: The values of the ordering columns.
+    :return: The cursor.
+    """
+    payload = [list(order_by), [_to_json(value) for value in values]]
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, order_by: tuple[str, ...]) -> list[Any]:
+    """
+    Returns the ordering values encoded in a cursor, still JSON typed.
+
+    :param cursor: The cursor.
+    :param order_by: The names of the ordering columns the cursor must be for.
+    :return: The values of the ordering columns.
+    :raises ValueError: If the cursor is malformed or for another ordering.
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        names, values = json.loads(data)
+    except (TypeError, ValueError) as exception:
+        raise ValueError("Invalid cursor") from exception
+
+    if names != list(order_by) or len(values) != len(order_by):
+        raise ValueError("Invalid cursor")
+
+    return values
+
+
+def from_json(value: Any, python_type: type) -> Any:
+    """
+    Converts a cursor value back to the Python type of its column.
+
+    :param value: The JSON typed value.
+    :param python_type: The Python type of the column.
+    :return: The value.
+    :raises ValueError: If the value does not fit the type.
+    """
+    if python_type in PARSERS:
+        try:
+            return PARSERS[python_type](value)
+        except (AttributeError, TypeError) as exception:
+            raise ValueError("Invalid cursor") from exception
+
+    if not isinstance(value, python_type):
+        raise ValueError("Invalid cursor")
+
+    return value
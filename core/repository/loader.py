@@ -0,0 +1,125 @@
+import asyncio
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from .base import BaseRepository
+
+LOADERS = "loaders"
+LOADER_LOCK = "loader_lock"
+
+
+class Loader:
+    """
+    Looks model instances up by one field for the lifetime of a session.
+    Lookups made in the same event loop iteration are sent as one
+    WHERE field IN (...) query, and instances found are remembered, so
+    dependencies and access checks can look up the same instance freely.
+    Missing values are not remembered, the negative cache handles those.
+    """
+
+    def __init__(
+        self, repository: "BaseRepository", field: str, lock: asyncio.Lock
+    ) -> None:
+        self.repository = repository
+        self.field = field
+        self.python_type = getattr(repository.model_class, field).type.python_type
+        self.lock = lock
+        self.futures: dict[Any, asyncio.Future] = {}
+        self.pending: dict[Any, asyncio.Future] = {}
+        self.task: asyncio.Task | None = None
+
+    @classmethod
+    def of(cls, repository: "BaseRepository", field: str) -> "Loader":
+        """
+        Returns the loader of the model field for the repository's session.
+
+        :param repository: The repository of the model.
+        :param field: The field to look up by.
+        :return: The loader.
+        """
+        info = repository.session.info
+        loaders = info.setdefault(LOADERS, {})
+        key = (repository.model_class, field)
+        if key not in loaders:
+            lock = info.setdefault(LOADER_LOCK, asyncio.Lock())
+            loaders[key] = cls(repository, field, lock)
+
+        return loaders[key]
+
+    @staticmethod
+    def forget(session: Any, model: type) -> None:
+        """
+        Forgets every instance of the model loaded in the session.
+
+        :param session: The session.
+        :param model: The model class.
+        """
+        loaders = session.info.get(LOADERS, {})
+        for key in [key for key in loaders if key[0] is model]:
+            del loaders[key]
+
+    def peek(self, value: Any) -> Any:
+        """
+        Returns the model instance already loaded for the value, without
+        querying, or None.
+
+        :param value: The value to look up.
+        :return: The model instance, or None.
+        """
+        if not isinstance(value, self.python_type):
+            value = self.python_type(value)
+
+        future = self.futures.get(value)
+        if future is None or not future.done() or future.exception() is not None:
+            return None
+
+        return future.result()
+
+    async def load(self, value: Any) -> Any:
+        """
+        Returns the model instance whose field equals the value, or None.
+
+        :param value: The value to look up.
+        :return: The model instance, or None.
+        """
+        if not isinstance(value, self.python_type):
+            value = self.python_type(value)
+
+        future = self.futures.get(value)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self.futures[value] = future
+            self.pending[value] = future
+            if self.task is None:
+                self.task = asyncio.create_task(self._dispatch())
+
+        # A cancelled caller must not cancel the lookup shared with others.
+        return await asyncio.shield(future)
+
+    async def _dispatch(self) -> None:
+        # The session runs one statement at a time, whatever the model.
+        async with self.lock:
+            pending, self.pending, self.task = self.pending, {}, None
+            try:
+                models = await self.repository.get_by(self.field, list(pending))
+            except Exception as exception:  # pylint: disable=broad-except
+                for value, future in pending.items():
+                    del self.futures[value]
+                    future.set_exception(exception)
+                return
+
+        found = {getattr(model, self.field): model for model in models}
+        for value, future in pending.items():
+            model = found.get(value)
+            if model is None:
+                del self.futures[value]
+            future.set_result(model)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_rolled_back(session: Session, previous_transaction: Any) -> None:
+    # Rolled back instances are expired and would have to be loaded again.
+    session.info.pop(LOADERS, None)
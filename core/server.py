@@ -6,13 +6,25 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from api import router
-from core.cache import Cache, CustomKeyMaker, RedisBackend
+from app import warmups  # noqa: F401 pylint: disable=unused-import
+from core.cache import (
+    Cache,
+    CacheTag,
+    CustomKeyMaker,
+    MemoryBackend,
+    RedisBackend,
+    TieredBackend,
+)
 from core.config import config
+from core.database.session import replicas
 from core.exceptions import CustomException
 from core.fastapi.dependencies import Logging
 from core.fastapi.middlewares import (
+    CONSISTENCY_TOKEN_HEADER,
     AuthBackend,
     AuthenticationMiddleware,
+    ResponseCacheMiddleware,
+    ResponseCacheRule,
     ResponseLoggerMiddleware,
     SQLAlchemyMiddleware,
 )
@@ -52,20 +64,58 @@ def make_middleware() -> List[Middleware]:
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
+            expose_headers=[
+                "ETag",
+                "X-Next-Cursor",
+                "X-Total-Count",
+                "X-Total-Count-Exact",
+                CONSISTENCY_TOKEN_HEADER,
+            ],
         ),
         Middleware(
             AuthenticationMiddleware,
             backend=AuthBackend(),
             on_error=on_auth_error,
         ),
+        Middleware(
+            ResponseCacheMiddleware,
+            rules=[
+                ResponseCacheRule(
+                    path="/v1/tasks/",
+                    tag=CacheTag.GET_TASK_LIST_BY_AUTHOR,
+                    principal_parameter="author_id",
+                ),
+                ResponseCacheRule(
+                    path="/v1/tasks/{task_uuid:uuid}", tag=CacheTag.GET_TASK
+                ),
+            ],
+        ),
         Middleware(SQLAlchemyMiddleware),
         Middleware(ResponseLoggerMiddleware),
     ]
     return middleware
 
 
-def init_cache() -> None:
-    Cache.init(backend=RedisBackend(), key_maker=CustomKeyMaker())
+def init_database(app_: FastAPI) -> None:
+    app_.add_event_handler("startup", replicas.start)
+    app_.add_event_handler("shutdown", replicas.stop)
+
+
+def init_cache(app_: FastAPI) -> None:
+    if config.CACHE_BACKEND == "memory":
+        backend = MemoryBackend()
+    else:
+        backend = RedisBackend()
+
+    if config.CACHE_LOCAL_ENABLED:
+        backend = TieredBackend(backend=backend)
+        app_.add_event_handler("startup", backend.start)
+        app_.add_event_handler("shutdown", backend.stop)
+
+    Cache.init(backend=backend, key_maker=CustomKeyMaker())
+
+    if config.CACHE_WARMUP_ON_STARTUP:
+        app_.add_event_handler("startup", Cache.warmup.run)
 
 
 def create_app() -> FastAPI:
@@ -80,7 +130,8 @@ def create_app() -> FastAPI:
     )
     init_routers(app_=app_)
     init_listeners(app_=app_)
-    init_cache()
+    init_database(app_=app_)
+    init_cache(app_=app_)
     return app_
 
 
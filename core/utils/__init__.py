@@ -1 +1,2 @@
 from .datetime import *
+from .histogram import Histogram
@@ -0,0 +1,26 @@
+from bisect import bisect_left
+from typing import Any
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """
+        Returns the cumulative count of observations per upper bound.
+        """
+        buckets, cumulative = {}, 0
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+
+        return {"buckets": buckets, "sum": self.sum, "count": self.count}
@@ -5,6 +5,7 @@ import pytest_asyncio
 from fastapi import FastAPI
 from httpx import AsyncClient
 
+from core.cache import Cache, CustomKeyMaker, MemoryBackend
 from core.factory.factory import get_session
 from core.server import create_app
 
@@ -29,6 +30,8 @@ async def client(app: FastAPI, db_session) -> AsyncClient:
         return db_session
 
     app.dependency_overrides[get_session] = _get_session
+    # The database is recreated for every test, so the cache has to be as well.
+    Cache.init(backend=MemoryBackend(), key_maker=CustomKeyMaker())
 
     async with AsyncClient(app=app, base_url="http://test") as client:
         yield client
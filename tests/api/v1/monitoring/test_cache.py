@@ -0,0 +1,25 @@
+import pytest
+from httpx import AsyncClient
+
+from core.cache import Cache
+from tests.utils.login import _create_user_and_login
+
+
+@pytest.mark.asyncio
+async def test_cache_metrics(client: AsyncClient):
+    Cache.metrics.reset()
+    await _create_user_and_login(client)
+
+    await client.get("/v1/tasks/")
+    await client.get("/v1/tasks/")
+
+    response = await client.get("v1/monitoring/cache/")
+    assert response.status_code == 200
+
+    # The first request misses both the response and the controller cache, the
+    # second one is answered from the response cache.
+    metrics = response.json()["get_task_list_by_author"]
+    assert metrics["hits"] == 1
+    assert metrics["misses"] == 2
+    assert metrics["hit_ratio"] == pytest.approx(1 / 3)
+    assert metrics["value_size"]["count"] == 2
@@ -0,0 +1,13 @@
+import pytest
+from httpx import AsyncClient
+
+
+@pytest.mark.asyncio
+async def test_database_pools(client: AsyncClient):
+    response = await client.get("v1/monitoring/database/")
+    assert response.status_code == 200
+
+    writer = response.json()["writer"]
+    assert writer["size"] == 5
+    assert writer["checked_out"] == 0
+    assert writer["timeouts"] == 0
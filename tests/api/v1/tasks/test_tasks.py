@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from httpx import AsyncClient
 
@@ -58,3 +60,85 @@ async def get_all_tasks(client: AsyncClient, db_session) -> None:
     response = await client.get("/v1/tasks/")
     assert response.status_code == 200
     assert len(response.json()) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_task_not_modified(client: AsyncClient, db_session) -> None:
+    """Test conditional get of a task."""
+    await _create_user_and_login(client)
+
+    response = await client.post("/v1/tasks/", json=create_fake_task())
+    task_uuid = response.json()["uuid"]
+
+    response = await client.get(f"/v1/tasks/{task_uuid}")
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = await client.get(
+        f"/v1/tasks/{task_uuid}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_get_task_cached_under_canonical_uuid(
+    client: AsyncClient, db_session
+) -> None:
+    """Test only the canonical spelling of a task uuid is cached."""
+    await _create_user_and_login(client)
+
+    response = await client.post("/v1/tasks/", json=create_fake_task())
+    task_uuid = response.json()["uuid"]
+
+    response = await client.get(f"/v1/tasks/{task_uuid.upper()}")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+    response = await client.get(f"/v1/tasks/{task_uuid.replace('-', '')}")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_invalidated_on_create(client: AsyncClient, db_session) -> None:
+    """Test cached task list is invalidated when a task is created."""
+    await _create_user_and_login(client)
+
+    await client.post("/v1/tasks/", json=create_fake_task())
+    response = await client.get("/v1/tasks/")
+    etag = response.headers["etag"]
+    assert len(response.json()) == 1
+
+    await client.post("/v1/tasks/", json=create_fake_task())
+    response = await client.get("/v1/tasks/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert len(response.json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_tasks(client: AsyncClient, db_session) -> None:
+    """Test streaming tasks as a JSON array and as NDJSON."""
+    await _create_user_and_login(client)
+
+    fake_tasks = [create_fake_task() for _ in range(3)]
+    for fake_task in fake_tasks:
+        await client.post("/v1/tasks/", json=fake_task)
+
+    response = await client.get("/v1/tasks/stream")
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert [task["title"] for task in response.json()] == [
+        fake_task["title"] for fake_task in fake_tasks
+    ]
+
+    response = await client.get(
+        "/v1/tasks/stream", headers={"Accept": "application/x-ndjson"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert len(lines) == 3
+    assert json.loads(lines[0])["title"] == fake_tasks[0]["title"]
@@ -1,5 +1,6 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
 
 from tests.factory.users import create_fake_user
 from tests.utils.login import _create_user_and_login
@@ -120,6 +121,42 @@ async def test_get_all_users(client: AsyncClient) -> None:
     assert response.json()[0]["email"] is not None
 
 
+@pytest.mark.asyncio
+async def test_get_users_by_page(client: AsyncClient) -> None:
+    """Test paging through users with cursors."""
+
+    for _ in range(2):
+        await client.post("/v1/users/", json=create_fake_user())
+    await _create_user_and_login(client, create_fake_user())
+
+    response = await client.get("/v1/users/", params={"limit": 2})
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["x-total-count"] == "3"
+    assert response.headers["x-total-count-exact"] == "true"
+    cursor = response.headers["x-next-cursor"]
+
+    response = await client.get("/v1/users/", params={"limit": 2, "after": cursor})
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert "x-next-cursor" not in response.headers
+
+    response = await client.get("/v1/users/", params={"after": "invalid"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_stream_users(client: AsyncClient) -> None:
+    """Test streaming users."""
+
+    await _create_user_and_login(client, create_fake_user())
+
+    response = await client.get("/v1/users/stream")
+    assert response.status_code == 200
+    assert len(response.json()) > 0
+    assert "password" not in response.json()[0]
+
+
 @pytest.mark.asyncio
 async def test_unauthorized_get_all_users(client: AsyncClient) -> None:
     """Test get all users."""
@@ -144,3 +181,24 @@ async def test_get_me(client: AsyncClient) -> None:
     assert response.json()["email"] == fake_user["email"]
     assert response.json()["username"] == fake_user["username"]
     assert response.json()["uuid"] is not None
+
+
+@pytest.mark.asyncio
+async def test_get_me_loads_user_once(client: AsyncClient, db_session) -> None:
+    """Test the permission check and current user share one lookup."""
+    await _create_user_and_login(client, create_fake_user())
+
+    statements = []
+    engine = db_session.bind.sync_engine
+
+    def listener(connection, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        response = await client.get("/v1/users/me")
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert response.status_code == 200
+    assert len([s for s in statements if "FROM users" in s]) == 1
@@ -15,6 +15,8 @@ TEST_DATABASE_URL = os.getenv("TEST_POSTGRES_URL")
 
 # Override the config to use the test database
 config.POSTGRES_URL = TEST_DATABASE_URL
+# and to cache in memory rather than in Redis
+config.CACHE_BACKEND = "memory"
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,150 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from core.cache import CacheMetrics, CacheTag, CustomKeyMaker, MemoryBackend
+from core.cache.cache_manager import CacheEntry, CacheManager
+
+
+@pytest.fixture
+def cache():
+    cache = CacheManager()
+    cache.init(backend=MemoryBackend(), key_maker=CustomKeyMaker())
+    return cache
+
+
+def test_cache_tag_parameters():
+    assert CacheTag.GET_USER_LIST.parameters == ()
+    assert CacheTag.GET_TASK_LIST_BY_AUTHOR.parameters == ("author_id",)
+    assert CacheTag.GET_TASK_LIST_BY_AUTHOR.format(author_id=1).endswith(":1")
+
+
+@pytest.mark.asyncio
+async def test_cached_method_with_parameterized_tag(cache):
+    class Controller:
+        def __init__(self):
+            self.calls = 0
+
+        @cache.cached(tag=CacheTag.GET_TASK_LIST_BY_AUTHOR)
+        async def get_tasks(self, author_id: int):
+            self.calls += 1
+            return [author_id]
+
+    controller = Controller()
+    assert await controller.get_tasks(1) == [1]
+    assert await controller.get_tasks(1) == [1]
+    assert controller.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_remove_by_parameterized_tag(cache):
+    calls = []
+
+    @cache.cached(tag=CacheTag.GET_TASK_LIST_BY_AUTHOR)
+    async def get_tasks(author_id: int):
+        calls.append(author_id)
+        return [author_id]
+
+    await get_tasks(1)
+    await get_tasks(author_id=2)
+    await cache.remove_by_tag(CacheTag.GET_TASK_LIST_BY_AUTHOR, author_id=1)
+    await get_tasks(1)
+    await get_tasks(2)
+
+    assert calls == [1, 2, 1]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call(cache):
+    calls = []
+
+    @cache.cached(prefix="users")
+    async def get_users():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["user"]
+
+    responses = await asyncio.gather(*(get_users() for _ in range(10)))
+
+    assert responses == [["user"]] * 10
+    assert len(calls) == 1
+    assert len({id(response) for response in responses}) == 10
+
+
+@pytest.mark.asyncio
+async def test_locked_miss_waits_for_other_process(cache):
+    @cache.cached(prefix="users", lock=True, lock_timeout=1)
+    async def get_users():
+        return ["mine"]
+
+    key = await cache.key_maker.make(function=get_users.__wrapped__, prefix="users")
+    await cache.backend.add(response=1, key=f"{key}::lock", ttl=1)
+
+    async def other_process():
+        await asyncio.sleep(0.01)
+        await cache.backend.set(response=["theirs"], key=key)
+
+    response, _ = await asyncio.gather(get_users(), other_process())
+
+    assert response == ["theirs"]
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing(cache):
+    calls = []
+
+    @cache.cached(prefix="users", ttl=60, stale_ttl=60)
+    async def get_users():
+        calls.append(1)
+        return len(calls)
+
+    assert await get_users() == 1
+
+    with patch("core.cache.cache_manager.time.time", return_value=time.time() + 61):
+        assert await get_users() == 1
+        await asyncio.gather(*cache._refreshes)
+
+    assert await get_users() == 2
+    assert len(calls) == 2
+
+
+def test_cache_entry_expires_early_with_beta():
+    entry = CacheEntry(value=1, expires_at=time.time() + 1, delta=10)
+
+    assert entry.is_fresh()
+    with patch("core.cache.cache_manager.random.random", return_value=0.99):
+        assert not entry.is_fresh(beta=1.0)
+
+
+@pytest.mark.asyncio
+async def test_cached_many_only_loads_missing_ids(cache):
+    calls = []
+
+    @cache.cached_many(prefix="users")
+    async def get_by_ids(ids: list[int]):
+        calls.append(ids)
+        return [SimpleNamespace(id=id_) for id_ in ids if id_ != 4]
+
+    first = await get_by_ids([1, 2])
+    second = await get_by_ids(ids=[3, 2, 1, 4])
+
+    assert [user.id for user in first] == [1, 2]
+    assert [user.id for user in second] == [3, 2, 1]
+    assert calls == [[1, 2], [3, 4]]
+
+
+@pytest.mark.asyncio
+async def test_backend_errors_are_counted_as_misses(cache):
+    cache.metrics = CacheMetrics()
+
+    @cache.cached(prefix="users")
+    async def get_users():
+        return ["user"]
+
+    with patch.object(cache.backend, "get", side_effect=ConnectionError):
+        assert await get_users() == ["user"]
+
+    assert cache.metrics.snapshot()["users"]["errors"] == 1
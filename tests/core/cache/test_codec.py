@@ -0,0 +1,42 @@
+import pickle
+
+import pytest
+
+from core.cache.codec import COMPRESSED, JSONCodec, PickleCodec, Serializer
+
+
+class Point:
+    def __init__(self, x: int):
+        self.x = x
+
+
+def test_serializer_tags_codec():
+    serializer = Serializer()
+
+    assert serializer.dumps({"a": 1})[0] == JSONCodec.format
+    assert serializer.dumps([1, 2])[0] == PickleCodec.format
+    assert serializer.loads(serializer.dumps({"a": 1})) == {"a": 1}
+    assert serializer.loads(serializer.dumps((1, 2))) == (1, 2)
+
+
+def test_serializer_falls_back_to_pickle():
+    serializer = Serializer(codec=JSONCodec())
+    data = serializer.dumps(Point(1))
+
+    assert data[0] == PickleCodec.format
+    assert serializer.loads(data).x == 1
+
+
+def test_serializer_compresses_large_values():
+    serializer = Serializer(codec=JSONCodec(), compress_threshold=100)
+    value = [{"title": "task"}] * 100
+    data = serializer.dumps(value)
+
+    assert data[0] == JSONCodec.format | COMPRESSED
+    assert len(data) < len(JSONCodec().dumps(value))
+    assert serializer.loads(data) == value
+
+
+def test_serializer_rejects_unknown_format():
+    with pytest.raises(ValueError):
+        Serializer().loads(pickle.dumps({"a": 1}, protocol=0))
@@ -0,0 +1,77 @@
+from uuid import UUID
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache.custom_key_maker import CustomKeyMaker, encode
+
+
+async def get_all(skip: int = 0, limit: int = 100, join_: set[str] | None = None):
+    ...
+
+
+async def get_by_session(session: AsyncSession, id_: int):
+    ...
+
+
+class Controller:
+    async def get_by_uuid(self, uuid: UUID):
+        ...
+
+
+class OtherController(Controller):
+    ...
+
+
+@pytest.fixture
+def key_maker():
+    return CustomKeyMaker()
+
+
+@pytest.mark.asyncio
+async def test_make_depends_on_argument_values(key_maker):
+    first_page = await key_maker.make(get_all, "users", args=(0,))
+    second_page = await key_maker.make(get_all, "users", args=(100,))
+
+    assert first_page != second_page
+    assert first_page.startswith("users::")
+
+
+@pytest.mark.asyncio
+async def test_make_is_independent_of_call_style(key_maker):
+    positional = await key_maker.make(get_all, "users", args=(0, 100))
+    keyword = await key_maker.make(get_all, "users", kwargs={"limit": 100})
+    defaults = await key_maker.make(get_all, "users")
+
+    assert positional == keyword == defaults
+
+
+@pytest.mark.asyncio
+async def test_make_skips_sessions_and_self(key_maker):
+    uuid = UUID("a3b8f042-1e16-4f0a-a8f0-421e16df0a2f")
+
+    assert await key_maker.make(
+        get_by_session, "users", args=(object(), 1)
+    ) == await key_maker.make(get_by_session, "users", args=(object(), 1))
+    assert await key_maker.make(
+        Controller.get_by_uuid, "tasks", args=(Controller(), uuid)
+    ) == await key_maker.make(
+        Controller.get_by_uuid, "tasks", args=(Controller(), uuid)
+    )
+    assert await key_maker.make(
+        Controller.get_by_uuid, "tasks", args=(Controller(), uuid)
+    ) != await key_maker.make(
+        Controller.get_by_uuid, "tasks", args=(OtherController(), uuid)
+    )
+
+
+def test_encode_is_canonical():
+    assert encode({"b": 1, "a": {2, 1}}) == encode({"a": {1, 2}, "b": 1})
+    assert encode(1) != encode("1")
+    assert encode(True) != encode(1)
+
+
+@pytest.mark.asyncio
+async def test_make_rejects_unsupported_arguments(key_maker):
+    with pytest.raises(TypeError, match="object argument"):
+        await key_maker.make(get_all, "users", args=(object(),))
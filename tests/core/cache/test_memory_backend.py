@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+import pytest
+
+from core.cache import MemoryBackend
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_round_trips_copies():
+    backend = MemoryBackend(max_bytes=1024)
+    value = {"tasks": [1, 2]}
+    await backend.set(response=value, key="tasks::1")
+    value["tasks"].append(3)
+
+    assert await backend.get("tasks::1") == {"tasks": [1, 2]}
+    assert await backend.get_many(["tasks::1", "tasks::2"]) == {
+        "tasks::1": {"tasks": [1, 2]}
+    }
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_expires_keys():
+    with patch("core.cache.memory_backend.time.monotonic", return_value=100):
+        backend = MemoryBackend(max_bytes=1024)
+        await backend.set(response=1, key="tasks::1", ttl=10)
+        await backend.set(response=2, key="tasks::2", ttl=100)
+    with patch("core.cache.memory_backend.time.monotonic", return_value=120):
+        assert await backend.get("tasks::2") == 2
+        assert len(backend) == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_evicts_within_budget():
+    backend = MemoryBackend(max_bytes=100, policy="lru")
+    await backend.set(response="a" * 20, key="t::1")
+    await backend.set(response="b" * 20, key="t::2")
+    await backend.get("t::1")
+    await backend.set(response="c" * 20, key="t::3")
+
+    assert backend.size <= 100
+    assert await backend.get("t::1") is not None
+    assert await backend.get("t::2") is None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_lfu_keeps_frequently_used_keys():
+    backend = MemoryBackend(max_bytes=100, policy="lfu")
+    await backend.set(response="a" * 20, key="t::1")
+    await backend.set(response="b" * 20, key="t::2")
+    await backend.get("t::1")
+    await backend.get("t::2")
+    await backend.get("t::2")
+    await backend.set(response="c" * 20, key="t::3")
+
+    assert await backend.get("t::1") is None
+    assert await backend.get("t::2") is not None
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_delete_startswith():
+    backend = MemoryBackend(max_bytes=1024)
+    await backend.set_many(responses={"users::1": 1, "users::2": 2, "tasks::1": 3})
+    await backend.delete_startswith("users")
+
+    assert len(backend) == 1
+    assert await backend.add(response=4, key="users::1")
+    assert not await backend.add(response=5, key="users::1")
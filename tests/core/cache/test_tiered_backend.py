@@ -0,0 +1,110 @@
+from typing import Any
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.cache.base import BaseBackend
+from core.cache.tiered_backend import LocalCache, TieredBackend
+
+
+class DictBackend(BaseBackend):
+    def __init__(self):
+        self.store = {}
+        self.gets = 0
+
+    async def get(self, key: str) -> Any:
+        self.gets += 1
+        return self.store.get(key)
+
+    async def set(self, response: Any, key: str, ttl: int = 60) -> None:
+        self.store[key] = response
+
+    async def get_many(self, keys: list[str]) -> dict[str, Any]:
+        return {key: self.store[key] for key in keys if key in self.store}
+
+    async def set_many(self, responses: dict[str, Any], ttl: int = 60) -> None:
+        self.store.update(responses)
+
+    async def add(self, response: Any, key: str, ttl: int = 60) -> bool:
+        if key in self.store:
+            return False
+
+        self.store[key] = response
+        return True
+
+    async def delete(self, key: str) -> None:
+        self.store.pop(key, None)
+
+    async def delete_startswith(self, value: str) -> None:
+        for key in [key for key in self.store if key.startswith(f"{value}::")]:
+            del self.store[key]
+
+
+def test_local_cache_evicts_least_recently_used():
+    cache = LocalCache(max_size=2, ttl=60)
+    cache.set("a::1", 1, 60)
+    cache.set("a::2", 2, 60)
+    cache.get("a::1")
+    cache.set("a::3", 3, 60)
+
+    assert cache.get("a::1") == 1
+    assert cache.get("a::3") == 3
+    assert len(cache) == 2
+
+
+def test_local_cache_expires_entries():
+    cache = LocalCache(max_size=2, ttl=60)
+    with patch("core.cache.tiered_backend.time.monotonic", return_value=0):
+        cache.set("a::1", 1, 10)
+    with patch("core.cache.tiered_backend.time.monotonic", return_value=11):
+        cache.get("a::1")
+        assert len(cache) == 0
+
+
+def test_local_cache_delete_startswith():
+    cache = LocalCache(max_size=10, ttl=60)
+    cache.set("users::1", 1, 60)
+    cache.set("tasks::1", 2, 60)
+    cache.delete_startswith("users")
+
+    assert len(cache) == 1
+    assert cache.get("tasks::1") == 2
+
+
+@pytest.mark.asyncio
+async def test_tiered_backend_serves_hits_from_memory():
+    remote = DictBackend()
+    backend = TieredBackend(backend=remote, max_size=10, ttl=60)
+    await backend.set(response=[1, 2], key="users::list", ttl=60)
+
+    assert await backend.get("users::list") == [1, 2]
+    assert remote.gets == 0
+
+
+@pytest.mark.asyncio
+async def test_tiered_backend_returns_copies():
+    remote = DictBackend()
+    backend = TieredBackend(backend=remote, max_size=10, ttl=60)
+    response = [1, 2]
+    await backend.set(response=response, key="users::list", ttl=60)
+    response.append(3)
+
+    first = await backend.get("users::list")
+    first.append(4)
+
+    assert await backend.get("users::list") == [1, 2]
+    assert await backend.get_many(["users::list"]) == {"users::list": [1, 2]}
+
+
+@pytest.mark.asyncio
+async def test_tiered_backend_broadcasts_invalidations():
+    remote = DictBackend()
+    backend = TieredBackend(backend=remote, max_size=10, ttl=60)
+    await backend.set(response=[1, 2], key="users::list", ttl=60)
+
+    with patch.object(backend.redis, "publish", AsyncMock()) as publish:
+        await backend.delete_startswith("users")
+
+    publish.assert_awaited_once_with(backend.channel, "users")
+    assert await backend.get("users::list") is None
+    assert remote.gets == 1
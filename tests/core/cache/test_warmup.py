@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from core.cache import CustomKeyMaker, MemoryBackend
+from core.cache.cache_manager import CacheManager
+
+
+@pytest.fixture
+def cache():
+    cache = CacheManager()
+    cache.init(backend=MemoryBackend(), key_maker=CustomKeyMaker())
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_warmup_populates_cache(cache):
+    calls = []
+
+    async def author_ids():
+        return [{"author_id": 1}, {"author_id": 2}]
+
+    @cache.warmup.register(arguments=author_ids)
+    @cache.cached(prefix="tasks")
+    async def get_tasks(author_id: int):
+        calls.append(author_id)
+        return [author_id]
+
+    assert await cache.warmup.run() == 2
+    assert await get_tasks(1) == [1]
+    assert sorted(calls) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_warmup_refresh_recomputes(cache):
+    calls = []
+
+    @cache.warmup.register()
+    @cache.cached(prefix="users")
+    async def get_users():
+        calls.append(1)
+        return ["user"]
+
+    await cache.warmup.run()
+    await cache.warmup.run()
+    assert len(calls) == 1
+
+    await cache.warmup.run(refresh=True)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_warmup_bounds_concurrency_and_skips_failures(cache):
+    running, peak = 0, 0
+
+    @cache.warmup.register(arguments=[{"value": value} for value in range(10)])
+    async def warm(value: int):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        if value % 2:
+            raise ValueError(value)
+
+    async def broken_arguments():
+        raise RuntimeError
+
+    cache.warmup.register(arguments=broken_arguments)(warm)
+
+    assert await cache.warmup.run(concurrency=3) == 5
+    assert peak == 3
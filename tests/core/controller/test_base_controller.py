@@ -0,0 +1,153 @@
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from faker import Faker
+from sqlalchemy import text
+
+from app.models import User
+from core.cache import Cache, CustomKeyMaker, MemoryBackend
+from core.controller import BaseController
+from core.database import Transactional
+from core.exceptions import NotFoundException
+from core.repository import BaseRepository
+
+fake = Faker()
+
+
+class NegativeCachingController(BaseController[User]):
+    negative_cache_ttl = 30
+
+
+class TestNegativeCache:
+    @pytest_asyncio.fixture
+    async def controller(self, db_session):
+        Cache.init(backend=MemoryBackend(), key_maker=CustomKeyMaker())
+        return NegativeCachingController(
+            model=User, repository=BaseRepository(model=User, db_session=db_session)
+        )
+
+    @pytest.mark.asyncio
+    async def test_missing_id_is_queried_once(self, controller):
+        with patch.object(
+            controller.repository, "get_by", wraps=controller.repository.get_by
+        ) as get_by:
+            for _ in range(3):
+                with pytest.raises(NotFoundException):
+                    await controller.get_by_id(1)
+
+        assert get_by.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_loaded_ids_skip_the_cache(self, controller):
+        user = await controller.create(
+            {
+                "email": fake.email(),
+                "username": fake.user_name(),
+                "password": fake.password(),
+            }
+        )
+        assert await controller.get_by_id(user.id) is user
+
+        with patch.object(Cache, "get", wraps=Cache.get) as get:
+            assert await controller.get_by_id(user.id) is user
+            assert await controller.get_by_uuid(user.uuid) is not None
+
+        assert get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_create_forgets_missing_ids(self, controller):
+        with pytest.raises(NotFoundException):
+            await controller.get_by_id(1)
+
+        user = await controller.create(
+            {
+                "email": fake.email(),
+                "username": fake.user_name(),
+                "password": fake.password(),
+            }
+        )
+
+        assert user.id == 1
+        assert await controller.get_by_id(1) is user
+
+    @pytest.mark.asyncio
+    async def test_missing_ids_are_forgotten_after_commit(self, controller):
+        with pytest.raises(NotFoundException):
+            await controller.get_by_id(1)
+
+        @Transactional()
+        async def create():
+            user = await controller.repository.create(
+                {
+                    "email": fake.email(),
+                    "username": fake.user_name(),
+                    "password": fake.password(),
+                }
+            )
+            await controller.repository.session.flush()
+            # A concurrent lookup before the commit caches the id as missing.
+            await controller._remember_missing("id", user.id)
+            return user
+
+        user = await create()
+        assert await controller.get_by_id(user.id) is user
+
+    @pytest.mark.asyncio
+    async def test_inserts_without_negative_cache_skip_invalidation(self, db_session):
+        repository = BaseRepository(model=User, db_session=db_session)
+        BaseController(model=User, repository=repository)
+
+        with patch.object(Cache, "remove_by_tag_on_commit") as remove:
+            await repository.create(
+                {
+                    "email": fake.email(),
+                    "username": fake.user_name(),
+                    "password": fake.password(),
+                }
+            )
+
+        remove.assert_not_called()
+
+
+class TestCount:
+    @pytest_asyncio.fixture
+    async def controller(self, db_session):
+        Cache.init(backend=MemoryBackend(), key_maker=CustomKeyMaker())
+        return BaseController(
+            model=User, repository=BaseRepository(model=User, db_session=db_session)
+        )
+
+    @pytest.mark.asyncio
+    async def test_count_is_reused(self, controller):
+        await self._create_users(controller, 2)
+
+        assert await controller.count() == (2, True)
+
+        await self._create_users(controller, 1)
+        assert await controller.count() == (2, True)
+        assert await controller.count({"is_admin": False}) == (3, True)
+
+    @pytest.mark.asyncio
+    async def test_count_estimates_large_tables(self, controller):
+        controller.count_cache_ttl = 0
+        controller.repository.count_estimate_threshold = 10
+        await self._create_users(controller, 20)
+        await controller.repository.session.execute(text("ANALYZE users"))
+
+        assert await controller.count() == (20, False)
+        assert await controller.count({"is_admin": False}) == (20, True)
+
+    @staticmethod
+    async def _create_users(controller, number):
+        await controller.repository.create_many(
+            [
+                {
+                    "email": fake.email(),
+                    "username": fake.unique.user_name(),
+                    "password": fake.password(),
+                }
+                for _ in range(number)
+            ]
+        )
+        await controller.repository.session.commit()
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import config
+from core.database.pool import InstrumentedQueuePool, pool_stats
+
+
+@pytest.mark.asyncio
+async def test_pool_stats():
+    engine = create_async_engine(
+        config.POSTGRES_URL,
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+    )
+
+    async with engine.connect():
+        stats = pool_stats({"writer": engine})["writer"]
+        assert stats["checked_out"] == 1
+        assert stats["idle"] == 0
+
+        with pytest.raises(exc.TimeoutError):
+            await engine.connect().start()
+
+    await engine.dispose()
+    async with engine.connect():
+        await asyncio.sleep(0)
+
+    stats = pool_stats({"writer": engine})["writer"]
+    assert stats["checked_out"] == 0
+    assert stats["idle"] == 1
+    assert stats["timeouts"] == 1
+    assert stats["wait"]["count"] == 3
+
+    await engine.dispose()
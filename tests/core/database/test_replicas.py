@@ -0,0 +1,97 @@
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.config import config
+from core.database.replicas import ReplicaSet, parse_lsn
+
+
+@pytest_asyncio.fixture
+async def engines():
+    writer = create_async_engine(config.POSTGRES_URL)
+    reader = create_async_engine(config.POSTGRES_URL)
+    unreachable = create_async_engine(
+        "postgresql+asyncpg://postgres@127.0.0.1:1/postgres"
+    )
+
+    yield writer, reader, unreachable
+
+    for engine in (writer, reader, unreachable):
+        await engine.dispose()
+
+
+def test_round_robin(engines):
+    writer, reader, other = engines
+    replicas = ReplicaSet(writer=writer, readers=[reader, other])
+
+    assert [replicas.choose() for _ in range(4)] == [reader, other, reader, other]
+
+
+@pytest.mark.asyncio
+async def test_least_connections(engines):
+    writer, reader, _ = engines
+    other = create_async_engine(config.POSTGRES_URL)
+    replicas = ReplicaSet(
+        writer=writer, readers=[reader, other], balancing="least_connections"
+    )
+
+    async with reader.connect():
+        assert replicas.choose() is other
+    async with other.connect():
+        assert replicas.choose() is reader
+
+    await other.dispose()
+
+
+def test_unknown_balancing(engines):
+    writer, reader, _ = engines
+
+    with pytest.raises(ValueError):
+        ReplicaSet(writer=writer, readers=[reader], balancing="random")
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_leaves_rotation(engines):
+    writer, reader, unreachable = engines
+    replicas = ReplicaSet(writer=writer, readers=[reader, unreachable])
+
+    await replicas.check()
+
+    assert [replica.healthy for replica in replicas.replicas] == [True, False]
+    assert {replicas.choose() for _ in range(4)} == {reader}
+    assert replicas.is_available(reader)
+    assert not replicas.is_available(unreachable)
+    assert not replicas.is_available(writer)
+
+
+@pytest.mark.asyncio
+async def test_lagging_replicas_fall_back_to_writer(engines):
+    writer, reader, unreachable = engines
+    replicas = ReplicaSet(writer=writer, readers=[reader, unreachable], max_lag=-1)
+
+    await replicas.check()
+
+    assert replicas.choose() is writer
+    assert replicas.is_available(writer)
+
+
+def test_parse_lsn():
+    assert parse_lsn("0/16B3748") == 0x16B3748
+    assert parse_lsn("16/B374D848") > parse_lsn("15/FFFFFFFF")
+
+    with pytest.raises(ValueError):
+        parse_lsn("not-an-lsn")
+
+
+@pytest.mark.asyncio
+async def test_replicas_behind_token_fall_back_to_writer(engines):
+    writer, reader, _ = engines
+    replicas = ReplicaSet(writer=writer, readers=[reader])
+
+    await replicas.check()
+    replayed = replicas.replicas[0].lsn
+
+    assert replayed > 0
+    assert replicas.choose(min_lsn=replayed) is reader
+    assert replicas.choose(min_lsn=replayed + 1) is writer
+    assert not replicas.is_available(reader, min_lsn=replayed + 1)
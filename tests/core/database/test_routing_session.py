@@ -0,0 +1,74 @@
+from importlib import import_module
+
+import pytest
+from faker import Faker
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.models import User
+from core.config import config
+from core.database import standalone_session
+from core.database.replicas import ReplicaSet
+from core.database.session import async_session_factory
+
+fake = Faker()
+# The package exports a `session` object that shadows the module attribute.
+session_module = import_module("core.database.session")
+
+
+@pytest.mark.asyncio
+async def test_flush_pins_reads_to_writer(db_session, monkeypatch):
+    writer = create_async_engine(config.POSTGRES_URL)
+    reader = create_async_engine(config.POSTGRES_URL)
+    monkeypatch.setitem(session_module.engines, "writer", writer)
+    monkeypatch.setattr(
+        session_module, "replicas", ReplicaSet(writer=writer, readers=[reader])
+    )
+
+    async with async_session_factory() as routing_session:
+        query = select(User)
+        assert routing_session.sync_session.get_bind(clause=query) is reader.sync_engine
+
+        routing_session.add(
+            User(email=fake.email(), password="password", username=fake.user_name())
+        )
+        await routing_session.flush()
+
+        assert routing_session.sync_session.get_bind(clause=query) is writer.sync_engine
+        await routing_session.rollback()
+
+    await writer.dispose()
+    await reader.dispose()
+
+
+@pytest.mark.asyncio
+async def test_session_is_created_on_first_use():
+    context = session_module.set_session_context()
+    try:
+        proxy = session_module.session
+        assert not proxy.has()
+        await proxy.remove()
+
+        assert proxy.info == {}
+        assert proxy.has()
+        created = session_module.get_session_context().session
+
+        assert proxy.info is created.info
+        await proxy.remove()
+        assert not proxy.has()
+    finally:
+        session_module.reset_session_context(context)
+
+
+@pytest.mark.asyncio
+async def test_standalone_session_is_isolated():
+    @standalone_session
+    async def unit_of_work():
+        return id(session_module.get_session_context())
+
+    context = session_module.set_session_context()
+    try:
+        assert await unit_of_work() != id(session_module.get_session_context())
+        assert not session_module.session.has()
+    finally:
+        session_module.reset_session_context(context)
@@ -0,0 +1,286 @@
+from importlib import import_module
+
+import pytest
+from faker import Faker
+from sqlalchemy import event, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.models import User
+from core.config import config
+from core.controller import BaseController
+from core.database import Propagation, Transactional, after_commit
+from core.database.replicas import ReplicaSet
+from core.exceptions import NotFoundException
+from core.repository import BaseRepository
+
+# The package exports a `session` object that shadows the module attribute.
+session_module = import_module("core.database.session")
+transactional_module = import_module("core.database.transactional")
+
+fake = Faker()
+
+
+def _user() -> User:
+    return User(email=fake.email(), password="password", username=fake.user_name())
+
+
+@pytest.mark.asyncio
+async def test_read_only_ends_its_transaction(db_session):
+    statements = []
+    engine = db_session.bind.sync_engine
+
+    def listener(connection, cursor, statement, *args):
+        statements.append(statement)
+
+    def commit_listener(connection):
+        statements.append("COMMIT")
+
+    @Transactional(propagation=Propagation.READ_ONLY)
+    async def read():
+        return await db_session.scalar(text("SHOW transaction_read_only"))
+
+    event.listen(engine, "commit", commit_listener)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        assert await read() == "on"
+    finally:
+        event.remove(engine, "commit", commit_listener)
+        event.remove(engine, "before_cursor_execute", listener)
+
+    # Nothing is flushed, and the transaction does not outlive the call.
+    assert statements == ["SHOW transaction_read_only", "COMMIT"]
+    assert not db_session.in_transaction()
+
+
+@pytest.mark.asyncio
+async def test_read_only_rejects_writes(db_session):
+    @Transactional(propagation=Propagation.READ_ONLY)
+    async def write():
+        db_session.add(_user())
+        await db_session.flush()
+
+    with pytest.raises(DBAPIError, match="read-only transaction"):
+        await write()
+
+
+@pytest.mark.asyncio
+async def test_write_after_read_only(db_session):
+    @Transactional(propagation=Propagation.READ_ONLY)
+    async def read():
+        return await db_session.scalar(text("SHOW transaction_read_only"))
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def write():
+        user = _user()
+        db_session.add(user)
+        await db_session.flush()
+        return await db_session.scalar(text("SHOW transaction_read_only"))
+
+    assert await read() == "on"
+    assert await write() == "off"
+    assert await read() == "on"
+
+
+@pytest.mark.asyncio
+async def test_plain_write_after_read_only(db_session):
+    @Transactional(propagation=Propagation.READ_ONLY)
+    async def read():
+        return await db_session.scalar(select(User))
+
+    user = _user()
+    db_session.add(user)
+    await db_session.commit()
+
+    assert await read() is user
+    user.is_admin = True
+    await db_session.commit()
+
+    db_session.expunge_all()
+    assert await db_session.scalar(select(User.is_admin))
+
+
+@pytest.mark.asyncio
+async def test_read_only_joins_open_transaction(db_session):
+    @Transactional(propagation=Propagation.READ_ONLY)
+    async def read():
+        return await db_session.scalar(text("SHOW transaction_read_only"))
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def write():
+        db_session.add(_user())
+        await db_session.flush()
+        return await read()
+
+    assert await write() == "off"
+
+
+@pytest.mark.asyncio
+async def test_read_only_joins_write_scope(db_session):
+    controller = BaseController(
+        model=User, repository=BaseRepository(model=User, db_session=db_session)
+    )
+    user = await controller.create(
+        {"email": fake.email(), "password": "password", "username": fake.user_name()}
+    )
+    user_id = user.id
+    db_session.expunge_all()
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def promote():
+        user = await controller.get_by_id(user_id)
+        user.is_admin = True
+
+    await promote()
+
+    db_session.expunge_all()
+    assert await db_session.scalar(select(User.is_admin).where(User.id == user_id))
+
+
+@pytest.mark.asyncio
+async def test_joined_scopes_do_not_roll_back(db_session):
+    controller = BaseController(
+        model=User, repository=BaseRepository(model=User, db_session=db_session)
+    )
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def fail():
+        raise ValueError()
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def create(user):
+        db_session.add(user)
+        await db_session.flush()
+        with pytest.raises(NotFoundException):
+            await controller.get_by_id(0)
+        with pytest.raises(ValueError):
+            await fail()
+
+    user = _user()
+    await create(user)
+
+    users = await db_session.scalars(select(User).where(User.email == user.email))
+    assert len(users.all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_read_only_deferrable(db_session):
+    @Transactional(propagation=Propagation.READ_ONLY, deferrable=True)
+    async def read():
+        return [
+            await db_session.scalar(text(f"SHOW {setting}"))
+            for setting in (
+                "transaction_read_only",
+                "transaction_isolation",
+                "transaction_deferrable",
+            )
+        ]
+
+    assert await read() == ["on", "serializable", "on"]
+
+
+@pytest.mark.asyncio
+async def test_required_new_uses_its_own_session(db_session, monkeypatch):
+    writer = create_async_engine(config.POSTGRES_URL)
+    monkeypatch.setitem(session_module.engines, "writer", writer)
+    monkeypatch.setattr(
+        session_module, "replicas", ReplicaSet(writer=writer, readers=[])
+    )
+    proxy = session_module.session
+    monkeypatch.setattr(transactional_module, "session", proxy)
+
+    @Transactional(propagation=Propagation.REQUIRED_NEW)
+    async def create(email):
+        proxy.add(User(email=email, password="password", username=email))
+        await proxy.flush()
+        return session_module.get_session_context()
+
+    context = session_module.set_session_context()
+    try:
+        await proxy.execute(text("SELECT 1"))
+        outer = session_module.get_session_context()
+
+        email = fake.email()
+        assert await create(email) is not outer
+        assert session_module.get_session_context() is outer
+        assert proxy.in_transaction()
+
+        # Committed independently of the outer transaction.
+        users = await db_session.scalars(select(User).where(User.email == email))
+        assert len(users.all()) == 1
+    finally:
+        await proxy.remove()
+        session_module.reset_session_context(context)
+        await writer.dispose()
+
+
+@pytest.mark.asyncio
+async def test_after_commit_runs_once_committed(db_session):
+    seen = []
+
+    async def callback():
+        # Runs outside the committed transaction, which a new one can see.
+        seen.append(await db_session.scalar(select(User.email)))
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def create(user):
+        db_session.add(user)
+        after_commit(db_session, callback, key="users")
+        after_commit(db_session, callback, key="users")
+        await db_session.flush()
+        assert not seen
+
+    user = _user()
+    await create(user)
+
+    assert seen == [user.email]
+
+
+@pytest.mark.asyncio
+async def test_after_commit_failures_do_not_fail_the_write(db_session, caplog):
+    seen = []
+
+    async def fail():
+        raise ConnectionError()
+
+    async def callback():
+        seen.append(True)
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def create(user):
+        db_session.add(user)
+        after_commit(db_session, fail)
+        after_commit(db_session, callback)
+        return user
+
+    user = _user()
+    assert await create(user) is user
+
+    assert seen == [True]
+    assert "After-commit callback" in caplog.text
+    users = await db_session.scalars(select(User).where(User.email == user.email))
+    assert len(users.all()) == 1
+
+
+@pytest.mark.asyncio
+async def test_after_commit_is_dropped_on_rollback(db_session):
+    seen = []
+
+    async def callback():
+        seen.append(True)
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def create():
+        db_session.add(_user())
+        after_commit(db_session, callback)
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        await create()
+
+    @Transactional(propagation=Propagation.REQUIRED)
+    async def noop():
+        pass
+
+    await noop()
+    assert not seen
@@ -1,8 +1,12 @@
 import pytest
 import pytest_asyncio
 from faker import Faker
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
 
-from app.models import User
+from app.models import Task, User
+from app.repositories import TaskRepository, UserRepository
+from core.database.statements import instrument_statement_cache
 from core.repository import BaseRepository
 
 fake = Faker()
@@ -26,6 +30,286 @@ class TestBaseRepository:
         users = await repository.get_all()
         assert len(users) == 2
 
+    @pytest.mark.asyncio
+    async def test_get_by_reuses_compiled_statement(self, repository):
+        metrics = instrument_statement_cache(repository.session.bind)
+        first = await repository.create(self._user_data_generator())
+        second = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        await repository.get_by("id", first.id, unique=True)
+        misses, hits = metrics.misses, metrics.hits
+        user = await repository.get_by("id", second.id, unique=True)
+
+        assert user is second
+        assert metrics.misses == misses
+        assert metrics.hits == hits + 1
+
+    @pytest.mark.asyncio
+    async def test_query_with_join_and_order(self, db_session):
+        repository = UserRepository(model=User, db_session=db_session)
+        await repository.create(self._user_data_generator())
+        await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        query = repository._query(join_={"tasks"}, order_={"asc": ["email"]})
+        users = await repository._all_unique(query)
+        assert [user.email for user in users] == sorted(user.email for user in users)
+        assert all(user.tasks == [] for user in users)
+
+    @pytest.mark.asyncio
+    async def test_join_strategies(self, db_session):
+        repository = UserRepository(model=User, db_session=db_session)
+        user = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+        await TaskRepository(model=Task, db_session=db_session).create_many(
+            [
+                {"title": "title", "description": "text", "task_author_id": user.id}
+                for _ in range(3)
+            ]
+        )
+        await repository.session.commit()
+
+        statements = []
+        engine = db_session.bind.sync_engine
+
+        def listener(connection, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            for join_, queries in (
+                ({"tasks"}, 2),
+                ({"tasks": "joined"}, 1),
+                ({"tasks": "immediate"}, 2),
+            ):
+                statements.clear()
+                repository.session.expunge_all()
+                (loaded,) = await repository.get_all(join_=join_)
+                assert len(loaded.tasks) == 3
+                assert len(statements) == queries
+
+            with pytest.raises(TypeError):
+                await repository.get_all(join_={"tasks": "subquery"})
+
+            statements.clear()
+            loaded = await repository.get_by(
+                "id", user.id, join_={"tasks": "joined"}, unique=True
+            )
+            assert loaded.id == user.id
+            assert "JOIN" in statements[0]
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+
+        with pytest.raises(TypeError):
+            repository._query(join_={"tasks": "lazy"})
+
+    @pytest.mark.asyncio
+    async def test_get_page(self, repository):
+        for _ in range(5):
+            await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        seen, cursor = [], None
+        for _ in range(3):
+            users, cursor = await repository.get_page(
+                after=cursor, limit=2, order_by=("created_at",)
+            )
+            seen.extend(user.id for user in users)
+            if cursor is None:
+                break
+
+        assert cursor is None
+        users = sorted(
+            await repository.get_all(), key=lambda user: (user.created_at, user.id)
+        )
+        assert seen == [user.id for user in users]
+
+    @pytest.mark.asyncio
+    async def test_get_page_rejects_foreign_cursor(self, repository):
+        for _ in range(2):
+            await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        _, cursor = await repository.get_page(limit=1)
+
+        with pytest.raises(ValueError):
+            await repository.get_page(after=cursor, order_by=("created_at",))
+        with pytest.raises(ValueError):
+            await repository.get_page(after="not-a-cursor")
+
+    @pytest.mark.asyncio
+    async def test_create_many(self, repository):
+        rows = [self._user_data_generator() for _ in range(3)]
+
+        users = await repository.create_many(rows, batch_size=2)
+        await repository.session.commit()
+
+        assert [user.email for user in users] == [row["email"] for row in rows]
+        assert all(user.id is not None and user.uuid is not None for user in users)
+        assert len(await repository.get_all()) == 3
+
+    @pytest.mark.asyncio
+    async def test_upsert_many(self, repository):
+        existing = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+        created_at = existing.created_at
+
+        rows = [
+            {**self._user_data_generator(), "email": existing.email},
+            self._user_data_generator(),
+        ]
+        users = await repository.upsert_many(rows, index_elements=["email"])
+        await repository.session.commit()
+
+        assert users[0] is existing
+        assert existing.username == rows[0]["username"]
+        assert existing.created_at == created_at
+        assert len(await repository.get_all()) == 2
+
+    @pytest.mark.asyncio
+    async def test_copy_many(self, repository):
+        rows = [self._user_data_generator() for _ in range(3)]
+
+        assert await repository.copy_many(rows) == 3
+        await repository.session.commit()
+
+        users = await repository.get_all()
+        assert sorted(user.email for user in users) == sorted(
+            row["email"] for row in rows
+        )
+        assert all(user.uuid is not None for user in users)
+
+    @pytest.mark.asyncio
+    async def test_stream(self, repository):
+        users = [await repository.create(self._user_data_generator()) for _ in range(5)]
+        await repository.session.commit()
+        ids = [user.id for user in users]
+
+        streamed = [
+            user.id
+            async for user in repository.stream(
+                {"id": ids[1:]}, order_by=("email",), yield_per=2
+            )
+        ]
+
+        assert streamed == [
+            user.id for user in sorted(users[1:], key=lambda user: user.email)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_all_loads_only_fields(self, repository):
+        data = self._user_data_generator()
+        await repository.create(data)
+        await repository.session.commit()
+        repository.session.expunge_all()
+
+        (user,) = await repository.get_all(fields={"email"})
+
+        assert user.email == data["email"]
+        assert user.id is not None
+        with pytest.raises(InvalidRequestError):
+            user.password
+
+    @pytest.mark.asyncio
+    async def test_rows(self, repository):
+        data = self._user_data_generator()
+        user = await repository.create(data)
+        await repository.session.commit()
+
+        (row,) = await repository.get_all(fields={"email", "username"}, rows=True)
+        assert row.email == data["email"]
+        assert row._fields == ("email", "username")
+
+        row = await repository.get_by("id", user.id, unique=True, rows=True)
+        assert row.password == data["password"]
+
+        streamed = [row async for row in repository.stream(rows=True)]
+        assert [row.id for row in streamed] == [user.id]
+
+    @pytest.mark.asyncio
+    async def test_get_page_rows(self, repository):
+        for _ in range(3):
+            await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        page, cursor = await repository.get_page(
+            limit=2, order_by=("email",), fields={"username"}, rows=True
+        )
+        rest, _ = await repository.get_page(
+            after=cursor, limit=2, order_by=("email",), fields={"username"}, rows=True
+        )
+
+        emails = [row.email for row in page + rest]
+        assert len(emails) == 3
+        assert emails == sorted(emails)
+
+    @pytest.mark.asyncio
+    async def test_update_where(self, repository):
+        first = await repository.create(self._user_data_generator())
+        second = await repository.create(self._user_data_generator())
+        other = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        updated = await repository.update_where(
+            {"id": [first.id, second.id]}, {"is_admin": True}
+        )
+
+        assert updated == 2
+        # Loaded instances are synchronized without a refresh.
+        assert first.is_admin is second.is_admin is True
+        assert other.is_admin is False
+
+    @pytest.mark.asyncio
+    async def test_update_where_returning(self, repository):
+        user = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        users = await repository.update_where(
+            {"email": user.email}, {"is_admin": True}, returning=True
+        )
+
+        assert users == [user]
+        assert user.is_admin is True
+
+    @pytest.mark.asyncio
+    async def test_delete_where(self, repository):
+        user = await repository.create(self._user_data_generator())
+        other = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        deleted = await repository.delete_where({"id": user.id}, returning=True)
+
+        assert [model.id for model in deleted] == [user.id]
+        assert user not in repository.session
+        assert await repository.get_all() == [other]
+        assert await repository.delete_where({"id": user.id}) == 0
+
+    @pytest.mark.asyncio
+    async def test_delete(self, repository):
+        user = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+        user_id = user.id
+
+        await repository.delete(user)
+        await repository.session.commit()
+
+        assert await repository.get_by("id", user_id) == []
+        assert await repository.load("id", user_id) is None
+
+    @pytest.mark.asyncio
+    async def test_where_requires_filters(self, repository):
+        await repository.create(self._user_data_generator())
+        await repository.session.commit()
+
+        with pytest.raises(ValueError):
+            await repository.update_where({}, {"is_admin": True})
+        with pytest.raises(ValueError):
+            await repository.delete_where({})
+
+        assert await repository.update_where({}, {"is_admin": True}, all_rows=True) == 1
+        assert await repository.delete_where({}, all_rows=True) == 1
+
     def _user_data_generator(self):
         return {
             "email": fake.email(),
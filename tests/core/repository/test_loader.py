@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+import pytest_asyncio
+from faker import Faker
+from sqlalchemy import event
+
+from app.models import User
+from core.repository import BaseRepository
+
+fake = Faker()
+
+
+class TestLoader:
+    @pytest_asyncio.fixture
+    async def repository(self, db_session):
+        return BaseRepository(model=User, db_session=db_session)
+
+    @pytest_asyncio.fixture
+    async def statements(self, db_session):
+        statements = []
+        engine = db_session.bind.sync_engine
+
+        def listener(connection, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        yield statements
+        event.remove(engine, "before_cursor_execute", listener)
+
+    @pytest.mark.asyncio
+    async def test_load_is_batched(self, repository, statements):
+        users = [await repository.create(self._user_data_generator()) for _ in range(3)]
+        await repository.session.commit()
+        statements.clear()
+
+        loaded = await asyncio.gather(
+            *(repository.load("id", user.id) for user in users),
+            repository.load("id", 0),
+        )
+
+        assert loaded == [*users, None]
+        assert len(statements) == 1
+        assert "IN" in statements[0]
+
+    @pytest.mark.asyncio
+    async def test_load_is_memoized(self, repository, statements):
+        user = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+        statements.clear()
+
+        assert await repository.load("uuid", str(user.uuid)) is user
+        assert await repository.load("uuid", user.uuid) is user
+        assert len(statements) == 1
+
+        assert await repository.load("id", 0) is None
+        assert await repository.load("id", 0) is None
+        assert len(statements) == 3
+
+    @pytest.mark.asyncio
+    async def test_load_forgets_deleted_and_rolled_back(self, repository, statements):
+        user = await repository.create(self._user_data_generator())
+        await repository.session.commit()
+        user_id = user.id
+
+        assert await repository.load("id", user_id) is user
+        await repository.session.rollback()
+        statements.clear()
+        assert await repository.load("id", user_id) is user
+        assert len(statements) == 1
+
+        await repository.delete_where({"id": user_id})
+        assert await repository.load("id", user_id) is None
+
+    def _user_data_generator(self):
+        return {
+            "email": fake.email(),
+            "username": fake.unique.user_name(),
+            "password": fake.password(),
+        }
@@ -6,7 +6,14 @@ celery_app = Celery(
     "worker",
     backend=config.CELERY_BACKEND_URL,
     broker=config.CELERY_BROKER_URL,
+    include=["worker.tasks.cache"],
 )
 
 celery_app.conf.task_routes = {"worker.celery_worker.test_celery": "test-queue"}
 celery_app.conf.update(task_track_started=True)
+celery_app.conf.beat_schedule = {
+    "warm-up-cache": {
+        "task": "worker.tasks.cache.warm_up_cache",
+        "schedule": config.CACHE_WARMUP_INTERVAL,
+    },
+}
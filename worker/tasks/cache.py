@@ -0,0 +1,31 @@
+import asyncio
+
+from app import warmups  # noqa: F401 pylint: disable=unused-import
+from core.cache import Cache, CustomKeyMaker, RedisBackend
+from core.config import config
+from core.database.session import engines
+from worker import celery_app
+
+
+async def _warm_up_cache() -> int:
+    backend = RedisBackend()
+    Cache.init(backend=backend, key_maker=CustomKeyMaker())
+    try:
+        return await Cache.warmup.run(refresh=True)
+    finally:
+        # Pooled connections are bound to this event loop, which the next run
+        # replaces.
+        await backend.redis.close()
+        for engine in engines.values():
+            await engine.dispose()
+
+
+@celery_app.task(name="worker.tasks.cache.warm_up_cache")
+def warm_up_cache() -> int:
+    """
+    Recomputes every registered cache warm-up so the shared cache stays populated.
+    """
+    if config.CACHE_BACKEND == "memory":
+        return 0
+
+    return asyncio.run(_warm_up_cache())